@@ -1,15 +1,36 @@
 from utils.ssl.Navigation import Navigation
 from utils.ssl.base_agent import BaseAgent
 from utils.Point import Point
-import math
+from utils.PointArray import PointArray
+from utils.Profiler import Profiler
 import numpy as np
 
-from hungarian import Hungarian
+from assignment import AssignmentCoordinator
 
 class ExampleAgent(BaseAgent):
-    def __init__(self, id=0, yellow=False):
+    def __init__(self, id=0, yellow=False, coordinator=None, spatial_index=None, planner=None, repulsion=True,
+                 predictor=None):
         super().__init__(id, yellow)
-        self.assignment = dict()  # Dicionário de atribuição de robôs para alvos
+        # Coordenador compartilhado pela equipe (atualizado pelo ambiente uma vez por frame).
+        # Sem coordenador externo, o agente usa um próprio e o atualiza a cada decisão.
+        self.owns_coordinator = coordinator is None
+        self.coordinator = AssignmentCoordinator() if coordinator is None else coordinator
+
+        # Índice espacial das posições do frame, construído pelo ambiente uma vez por frame.
+        # Sem ele, o desvio de obstáculos percorre todos os oponentes.
+        self.spatial_index = spatial_index
+
+        # Planejador de trajetória (PathPlanner) compartilhado pela equipe, com um caminho em cache por robô.
+        # Sem ele, o desvio de obstáculos é feito por vetores de repulsão.
+        self.planner = planner
+
+        # Com repulsion=False o agente segue direto para o alvo; o ambiente corrige as velocidades
+        # de toda a equipe de uma vez (modo ORCA).
+        self.repulsion = repulsion
+
+        # Posições previstas (MotionPredictor) calculadas pelo ambiente uma vez por frame.
+        # Com elas, o desvio considera onde os obstáculos estarão daqui a predictor.lookahead segundos.
+        self.predictor = predictor
 
     def decision(self):
         # Nenhum alvo disponível, decision() não faz nada
@@ -17,31 +38,24 @@ class ExampleAgent(BaseAgent):
             # Early return, never nested
             return
 
-        # Obter lista de IDs dos robôs disponíveis na equipe
-        my_agents = list(self.teammates.keys())
-
-        # Calcular a matriz de custos (distâncias) entre robôs e targets
-        cost_matrix = self.calculate_cost_matrix(my_agents)
-
-        # Resolver o problema de atribuição com o algoritmo Hungarian
-        assignments = Hungarian.solve(cost_matrix)
-
-        # Atualizar as atribuições
-        self.assignment = {my_agents[robot_ID]: self.targets[target_ID] 
-                           for robot_ID, target_ID in assignments}
+        # A atribuição da equipe é resolvida uma vez por frame pelo coordenador
+        if self.owns_coordinator:
+            self.coordinator.update(self.teammates, self.targets)
 
         # Se o robô atual não tiver um alvo atribuído, decision() não faz nada
-        if self.id not in self.assignment:
+        assigned_target = self.coordinator.target_for(self.id)
+        if assigned_target is None:
             return
-        
-        assigned_target  = self.assignment[self.id]
+
         current_position = Point(self.robot.x, self.robot.y)
 
         # Ajustar a rota para desviar de obstáculos
-        adjusted_target = self.avoid_obstacles(current_position, assigned_target)
+        with Profiler.section("ExampleAgent.avoid_obstacles"):
+            adjusted_target = self.avoid_obstacles(current_position, assigned_target)
 
         # Calcular e definir velocidades do robô
-        target_velocity, target_angle_velocity = Navigation.goToPoint(self.robot, adjusted_target)
+        with Profiler.section("ExampleAgent.goToPoint"):
+            target_velocity, target_angle_velocity = Navigation.goToPoint(self.robot, adjusted_target)
         velocity_factor = 0.5
 
         self.set_vel(target_velocity * velocity_factor)
@@ -50,7 +64,7 @@ class ExampleAgent(BaseAgent):
     
     def post_decision(self):
         # Se o robô já tem um alvo atribuído, ele deve continuar sua tarefa
-        if self.id in self.assignment:
+        if self.coordinator.target_for(self.id) is not None:
             # Early return, never nested
             return
         
@@ -70,34 +84,25 @@ class ExampleAgent(BaseAgent):
             return
         
         # Calcular e definir velocidades do robô
-        adjusted_target = self.avoid_obstacles(current_position, closest_target)
-        target_velocity, target_angle_velocity = Navigation.goToPoint(self.robot, adjusted_target)
+        with Profiler.section("ExampleAgent.avoid_obstacles"):
+            adjusted_target = self.avoid_obstacles(current_position, closest_target)
+        with Profiler.section("ExampleAgent.goToPoint"):
+            target_velocity, target_angle_velocity = Navigation.goToPoint(self.robot, adjusted_target)
         velocity_factor = 0.5
 
         self.set_vel(target_velocity * velocity_factor)
         self.set_angle_vel(target_angle_velocity)
         return
 
-    # Calcula a matriz de custos entre os robôs e os alvos.
-    # O custo é baseado na distância euclidiana entre cada robô e alvo.
-    def calculate_cost_matrix(self, my_agents):
-        num_agents = len(my_agents)
-        num_targets = len(self.targets)
-
-        # Inicializa as dimensões da matriz de custos
-        cost_matrix = np.zeros((num_agents, num_targets))
-
-        # Preenche a matriz de custos
-        for i, robot_id in enumerate(my_agents):
-            robot = self.teammates[robot_id]  # Posição do robô
-            for j, target in enumerate(self.targets):
-                # Calcula a distância euclidiana entre o robô e o alvo
-                cost_matrix[i, j] = Point(robot.x, robot.y).dist_to(target)
-
-        return cost_matrix
-
     # Ajusta a rota para desviar de obstáculos
     def avoid_obstacles(self, current_position, target_position):
+        # Com um planejador, segue o caminho planejado em volta de todos os outros robôs
+        if self.planner is not None:
+            return self.planner.steer(self.id, current_position, target_position, self.obstacle_positions())
+
+        if not self.repulsion:
+            return target_position
+
         # Parâmetro que define a distância mínima segura que os robôs devem manter de obstáculos. 
         # Essa distância é usada para determinar se um robô será ou não repelido por um obstáculo.
         safe_distance = 0.35
@@ -107,33 +112,47 @@ class ExampleAgent(BaseAgent):
         # Um valor maior implica em um desvio mais significativo.
         adjustment_factor = 1.7
         
-        adjusted_position = target_position
-        for robot_id, opponent in self.opponents.items():
-            obstacle_position = Point(opponent.x, opponent.y)
-            distance_to_obstacle = current_position.dist_to(obstacle_position)
-
-            # Se o não obstáculo estiver dentro da zona de risco, não é necessário desviar dele
-            if not distance_to_obstacle < safe_distance:
-                # Never nested
-                continue
-            
-            # Obstáculo está dentro da zona de risco e o robô deve desviar dele.
-            # Calcula o ângulo entre o robô atual e o obstáculo.
-            angle_to_obstacle = math.atan2(
-                obstacle_position.y - current_position.y,
-                obstacle_position.x - current_position.x,
-            )
-
-            # Calcula as componentes do vetor de repulsão em X e Y baseado no seno 
-            # e cosseno (projeções nos eixos) do ângulo.
-            repulsion_x = -math.cos(angle_to_obstacle) * adjustment_factor
-            repulsion_y = -math.sin(angle_to_obstacle) * adjustment_factor
-
-            # Ajusta o destino final para desviar do obstáculo.
-            # Rota desvia do obstáculo e continua a busca pelo alvo original.
-            adjusted_position = Point(
-                adjusted_position.x + repulsion_x,
-                adjusted_position.y + repulsion_y,
-            )
-
-        return adjusted_position
+        obstacles = self.nearby_obstacles(current_position, safe_distance)
+        if len(obstacles) == 0:
+            return target_position
+
+        # Obstáculos dentro da zona de risco, o robô deve desviar de todos eles.
+        # Calcula de uma só vez o ângulo entre o robô atual e cada obstáculo.
+        angles_to_obstacles = (obstacles - current_position).angle()
+
+        # Calcula as componentes dos vetores de repulsão em X e Y baseado no seno 
+        # e cosseno (projeções nos eixos) dos ângulos e soma todas elas.
+        repulsion_x = -np.sum(np.cos(angles_to_obstacles)) * adjustment_factor
+        repulsion_y = -np.sum(np.sin(angles_to_obstacles)) * adjustment_factor
+
+        # Ajusta o destino final para desviar dos obstáculos.
+        # Rota desvia dos obstáculos e continua a busca pelo alvo original.
+        return Point(
+            target_position.x + float(repulsion_x),
+            target_position.y + float(repulsion_y),
+        )
+
+    # Posições de todos os outros robôs do campo
+    def obstacle_positions(self):
+        # Posições atuais e previstas, para o planejador evitar também o caminho dos obstáculos
+        if self.predictor is not None:
+            keep = self.predictor.snapshot.mask(exclude=self.id)
+            return np.vstack((self.predictor.current[keep], self.predictor.predicted[keep]))
+
+        if hasattr(self.opponents, "positions"):
+            return self.opponents.positions
+        return PointArray.from_points(Point(opponent.x, opponent.y) for opponent in self.opponents.values()).xy
+
+    # Posições dos obstáculos dentro da zona de risco (distância menor que radius).
+    # Usa a consulta por raio do índice espacial compartilhado quando disponível; o ambiente
+    # o constrói sobre as posições previstas quando há previsão de movimento.
+    def nearby_obstacles(self, current_position, radius):
+        if self.spatial_index is None:
+            if self.predictor is not None:
+                obstacles = PointArray(self.predictor.predicted[self.predictor.snapshot.mask(exclude=self.id)])
+            else:
+                obstacles = PointArray.from_points(Point(opponent.x, opponent.y) for opponent in self.opponents.values())
+            return obstacles[obstacles.dist_to(current_position) < radius]
+
+        _, positions = self.spatial_index.query_radius(current_position, radius, exclude=self.id)
+        return PointArray(positions)
@@ -0,0 +1,308 @@
+# Coordenação da atribuição robô -> alvo para a equipe inteira.
+# Assim como hungarian.py, fica na raiz do projeto para destacar o que foi criado.
+
+import time
+
+import numpy as np
+
+from utils.ssl.CostMatrix import CostMatrix
+from utils.Profiler import Profiler
+from hungarian import IncrementalAssignment, JonkerVolgenant
+
+# Resolve a atribuição uma única vez por frame e distribui o resultado para
+# todos os ExampleAgent da equipe, em vez de cada agente refazer o mesmo cálculo.
+class AssignmentCoordinator:
+    def __init__(self, cost_model=CostMatrix.euclidean):
+        self.assignment = dict()  # Dicionário de atribuição {robot_id: target}
+
+        # Modelo de custo plugável: model(poses (N, 3), targets (M, 2)) -> matriz (N, M).
+        # Ex.: CostMatrix.euclidean (padrão) ou CostMatrix.time_to_reach.
+        self.cost_model = cost_model
+
+        # Reaproveita potenciais duais e emparelhamento entre frames consecutivos
+        self.solver = IncrementalAssignment()
+
+    # Recalcula a atribuição da equipe para o frame atual
+    def update(self, teammates, targets):
+        # Nenhum alvo disponível, nenhum robô recebe tarefa
+        if len(targets) == 0:
+            self.assignment = dict()
+            self.solver.reset()
+            return self.assignment
+
+        # Obter lista de IDs dos robôs disponíveis na equipe
+        my_agents = list(teammates.keys())
+
+        # Calcular a matriz de custos entre robôs e targets (vetorizada, via broadcast)
+        with Profiler.section("AssignmentCoordinator.cost_matrix"):
+            cost_matrix = CostMatrix.build([teammates[id] for id in my_agents], targets, self.cost_model)
+
+        # Resolver o problema de atribuição e atualizar as atribuições
+        with Profiler.section("AssignmentCoordinator.solve"):
+            assignments = self.solver.solve(cost_matrix, my_agents, targets)
+            self.assignment = {my_agents[robot_ID]: targets[target_ID]
+                               for robot_ID, target_ID in assignments}
+        return self.assignment
+
+    # Fatia da atribuição correspondente a um robô (None se não houver alvo para ele)
+    def target_for(self, robot_id):
+        return self.assignment.get(robot_id)
+
+
+# Agendamento orientado a eventos: em vez de resolver a atribuição a cada tick, só resolve
+# quando algo mudou de fato (alvo coletado, alvos novos, robô novo na equipe) ou quando
+# algum custo se afastou mais que `drift` do valor usado na última solução. Nos demais
+# ticks a atribuição anterior é reaproveitada. Toda nova solução dá um desconto de
+# `hysteresis` aos pares atuais, então um robô só troca de alvo se o ganho superar a margem
+# (evita que custos quase iguais façam os robôs trocarem de alvo a cada frame).
+class EventDrivenCoordinator(AssignmentCoordinator):
+    def __init__(self, cost_model=CostMatrix.euclidean, drift=0.1, hysteresis=0.05):
+        super().__init__(cost_model)
+        self.drift = drift            # Variação de custo que força uma nova solução
+        self.hysteresis = hysteresis  # Vantagem mínima para um robô trocar de alvo
+
+        self.robot_ids = []           # Robôs e alvos da última solução
+        self.targets = []
+        self.solved_costs = None      # Matriz de custos usada na última solução
+
+        self.solves = 0               # Estatísticas: soluções, ticks reaproveitados e trocas de alvo
+        self.reuses = 0
+        self.switches = 0
+
+    def update(self, teammates, targets):
+        if len(targets) == 0:
+            self.assignment = dict()
+            self.solver.reset()
+            self.robot_ids, self.targets, self.solved_costs = [], [], None
+            return self.assignment
+
+        my_agents = list(teammates.keys())
+        with Profiler.section("AssignmentCoordinator.cost_matrix"):
+            cost_matrix = CostMatrix.build([teammates[id] for id in my_agents], targets, self.cost_model)
+
+        # Sem eventos e com custos próximos dos da última solução, nada a refazer
+        changed = my_agents != self.robot_ids or list(targets) != self.targets
+        if not changed and np.max(np.abs(cost_matrix - self.solved_costs)) < self.drift:
+            self.reuses += 1
+            return self.assignment
+
+        with Profiler.section("AssignmentCoordinator.solve"):
+            # Histerese: os pares atuais ficam mais baratos por uma margem fixa
+            biased = cost_matrix.copy()
+            target_index = {target: j for j, target in enumerate(targets)}
+            for i, id in enumerate(my_agents):
+                j = target_index.get(self.assignment.get(id))
+                if j is not None:
+                    biased[i, j] -= self.hysteresis
+
+            assignments = self.solver.solve(biased, my_agents, targets)
+            assignment = {my_agents[robot_ID]: targets[target_ID] for robot_ID, target_ID in assignments}
+
+        # Conta só as trocas em que o alvo anterior do robô ainda existe
+        self.switches += sum(1 for id, target in assignment.items()
+                             if self.assignment.get(id, target) != target and self.assignment[id] in target_index)
+        self.solves += 1
+
+        self.assignment = assignment
+        self.robot_ids, self.targets, self.solved_costs = my_agents, list(targets), cost_matrix
+        return self.assignment
+
+
+# Sequenciamento de alvos (mTSP): cada robô recebe uma rota ordenada de alvos, e o alvo
+# atual dele é o primeiro da rota. As rotas são mantidas entre frames: alvos coletados
+# saem, alvos novos entram por inserção gulosa e uma busca local (2-opt, or-opt e trocas
+# entre rotas) melhora as rotas, tudo dentro de um orçamento de tempo por tick.
+class TourCoordinator:
+    def __init__(self, budget=0.001, total_weight=0.1, stop_cost=1.0):
+        self.assignment = dict()  # Dicionário de atribuição {robot_id: target}, primeiro alvo de cada rota
+        self.tours = dict()       # Rotas {robot_id: [target, ...]} em ordem de visita
+
+        # Tempo máximo (s) de inserção e busca local por chamada de update()
+        self.budget = budget
+
+        # Objetivo: tempo para limpar a rodada (maior rota) + total_weight * soma das rotas
+        self.total_weight = total_weight
+
+        # Distância equivalente ao tempo que o robô perde freando num alvo e acelerando para o próximo
+        self.stop_cost = stop_cost
+
+    # Recalcula as rotas da equipe para o frame atual
+    def update(self, teammates, targets):
+        # Nenhum alvo disponível ou nenhum robô na equipe: ninguém recebe tarefa, como nos outros coordenadores
+        if len(targets) == 0 or len(teammates) == 0:
+            self.assignment = dict()
+            self.tours = dict()
+            return self.assignment
+
+        # Prazo único para o update() inteiro: inserção e busca local param quando ele vence
+        deadline = time.perf_counter() + self.budget
+
+        my_agents = list(teammates.keys())
+        n = len(my_agents)
+
+        # Distâncias entre todos os nós: robôs (0..n-1) e alvos (n..n+m-1)
+        with Profiler.section("TourCoordinator.cost_matrix"):
+            poses = CostMatrix.poses([teammates[id] for id in my_agents])
+            nodes = np.vstack((poses[:, :2], CostMatrix.points(targets)))
+            delta = nodes[:, np.newaxis, :] - nodes[np.newaxis, :, :]
+            distances = np.hypot(delta[..., 0], delta[..., 1])
+            dist = distances.tolist()
+
+        with Profiler.section("TourCoordinator.solve"):
+            node_of = dict()
+            for j, target in enumerate(targets):
+                node_of.setdefault(target, n + j)
+
+            # Rotas do frame anterior, sem os alvos já coletados
+            tours, seen = [], set()
+            for id in my_agents:
+                tour = [node_of[t] for t in self.tours.get(id, []) if t in node_of and node_of[t] not in seen]
+                seen.update(tour)
+                tours.append(tour)
+
+            missing = [node for node in node_of.values() if node not in seen]
+            self.insert(tours, missing, dist, deadline)
+
+            # As rotas herdadas podem ter ficado presas num ótimo local depois que os robôs andaram;
+            # a atribuição um-para-um (JV) completada por inserção serve de semente alternativa
+            # e fica a melhor das duas, então o objetivo nunca fica pior que o da atribuição simples
+            target_nodes = list(node_of.values())
+            matched = [[] for _ in my_agents]
+            for robot, column in JonkerVolgenant.solve(distances[:n, target_nodes]):
+                matched[robot].append(target_nodes[column])
+            assigned = {node for tour in matched for node in tour}
+            self.insert(matched, [node for node in target_nodes if node not in assigned], dist, deadline)
+            if self.cost(matched, dist) < self.cost(tours, dist):
+                tours = matched
+
+            self.improve(tours, dist, deadline)
+
+            self.tours = {id: [targets[node - n] for node in tour] for id, tour in zip(my_agents, tours)}
+            self.assignment = {id: tour[0] for id, tour in self.tours.items() if tour}
+        return self.assignment
+
+    # Fatia da atribuição correspondente a um robô (None se não houver alvo para ele)
+    def target_for(self, robot_id):
+        return self.assignment.get(robot_id)
+
+    # Comprimento da rota aberta do robô r (começa na posição dele, não retorna), com
+    # stop_cost metros a mais por alvo depois do primeiro
+    def length(self, r, tour, dist):
+        if not tour:
+            return 0.0
+        total = dist[r][tour[0]] + self.stop_cost * (len(tour) - 1)
+        for a, b in zip(tour, tour[1:]):
+            total += dist[a][b]
+        return total
+
+    def objective(self, lengths):
+        return max(lengths) + self.total_weight * sum(lengths)
+
+    def cost(self, tours, dist):
+        return self.objective([self.length(r, tour, dist) for r, tour in enumerate(tours)])
+
+    # Inserção gulosa: a cada passo, insere o alvo na rota e posição que menos pioram o objetivo.
+    # Se o prazo vencer, cada alvo que sobrar vai para o fim da rota que fica mais curta com ele
+    def insert(self, tours, missing, dist, deadline):
+        lengths = [self.length(r, tour, dist) for r, tour in enumerate(tours)]
+        missing = list(missing)
+        while missing:
+            # Maior rota sem contar a rota r, para avaliar o objetivo em O(1) por posição
+            order = sorted(range(len(tours)), key=lengths.__getitem__, reverse=True)
+            top, second = lengths[order[0]], (lengths[order[1]] if len(order) > 1 else 0.0)
+            total = sum(lengths)
+            best = None
+            for node in missing:
+                if time.perf_counter() > deadline:
+                    break
+                for r, tour in enumerate(tours):
+                    others = second if r == order[0] else top
+                    prev = r
+                    for p in range(len(tour) + 1):
+                        if p < len(tour):
+                            added = dist[prev][node] + dist[node][tour[p]] - dist[prev][tour[p]] + self.stop_cost
+                            prev = tour[p]
+                        else:
+                            added = dist[prev][node] + (self.stop_cost if tour else 0.0)
+                        cost = max(others, lengths[r] + added) + self.total_weight * (total + added)
+                        if best is None or cost < best[0]:
+                            best = (cost, node, r, p)
+            if best is None:
+                break
+            _, node, r, p = best
+            tours[r].insert(p, node)
+            lengths[r] = self.length(r, tours[r], dist)
+            missing.remove(node)
+
+        for node in missing:
+            r = min(range(len(tours)), key=lambda r: lengths[r] + dist[tours[r][-1] if tours[r] else r][node])
+            tours[r].append(node)
+            lengths[r] = self.length(r, tours[r], dist)
+
+    # Busca local até não haver melhora ou o orçamento de tempo acabar
+    def improve(self, tours, dist, deadline):
+        lengths = [self.length(r, tour, dist) for r, tour in enumerate(tours)]
+        improved = True
+        while improved and time.perf_counter() < deadline:
+            improved = (self._two_opt(tours, lengths, dist, deadline) or self._or_opt(tours, lengths, dist, deadline)
+                        or self._swap(tours, lengths, dist, deadline))
+
+    # 2-opt dentro de cada rota: inverte um trecho se isso encurta a rota
+    def _two_opt(self, tours, lengths, dist, deadline):
+        for r, tour in enumerate(tours):
+            for i in range(len(tour) - 1):
+                if time.perf_counter() > deadline:
+                    return False
+                for j in range(i + 1, len(tour)):
+                    candidate = tour[:i] + tour[i:j + 1][::-1] + tour[j + 1:]
+                    new_length = self.length(r, candidate, dist)
+                    if new_length < lengths[r] - 1e-9:
+                        tours[r], lengths[r] = candidate, new_length
+                        return True
+        return False
+
+    # or-opt: move um trecho de 1 a 3 alvos (em qualquer sentido) para outra posição, na mesma ou em outra rota
+    def _or_opt(self, tours, lengths, dist, deadline):
+        current = self.objective(lengths)
+        for a, tour in enumerate(tours):
+            for size in (1, 2, 3):
+                for i in range(len(tour) - size + 1):
+                    if time.perf_counter() > deadline:
+                        return False
+                    segment, rest = tour[i:i + size], tour[:i] + tour[i + size:]
+                    rest_length = self.length(a, rest, dist)
+                    for b in range(len(tours)):
+                        base = rest if b == a else tours[b]
+                        for p in range(len(base) + 1):
+                            for piece in ((segment, segment[::-1]) if size > 1 else (segment,)):
+                                candidate = base[:p] + piece + base[p:]
+                                new_lengths = list(lengths)
+                                new_lengths[a] = rest_length
+                                new_lengths[b] = self.length(b, candidate, dist)
+                                if self.objective(new_lengths) < current - 1e-9:
+                                    if b != a:
+                                        tours[a] = rest
+                                    tours[b] = candidate
+                                    lengths[:] = new_lengths
+                                    return True
+        return False
+
+    # Troca: dois alvos de rotas diferentes trocam de lugar
+    def _swap(self, tours, lengths, dist, deadline):
+        current = self.objective(lengths)
+        for a in range(len(tours)):
+            for b in range(a + 1, len(tours)):
+                if time.perf_counter() > deadline:
+                    return False
+                for i in range(len(tours[a])):
+                    for j in range(len(tours[b])):
+                        tour_a = tours[a][:i] + [tours[b][j]] + tours[a][i + 1:]
+                        tour_b = tours[b][:j] + [tours[a][i]] + tours[b][j + 1:]
+                        new_lengths = list(lengths)
+                        new_lengths[a] = self.length(a, tour_a, dist)
+                        new_lengths[b] = self.length(b, tour_b, dist)
+                        if self.objective(new_lengths) < current - 1e-9:
+                            tours[a], tours[b] = tour_a, tour_b
+                            lengths[:] = new_lengths
+                            return True
+        return False
@@ -0,0 +1,295 @@
+import ast
+import itertools
+import json
+import math
+import re
+import signal
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+from hungarian import Hungarian, JonkerVolgenant, IncrementalAssignment, BatchAssignment
+from utils.CLI import benchmark_cli
+
+SOLVERS = {
+    "hungarian": lambda cost_matrix: Hungarian.solve(cost_matrix.copy()),
+    "jv": JonkerVolgenant.solve,
+    "incremental": lambda cost_matrix: IncrementalAssignment().solve(cost_matrix, range(cost_matrix.shape[0]),
+                                                                     range(cost_matrix.shape[1])),
+    "batch": lambda cost_matrix: BatchAssignment.solve([cost_matrix])[0],
+}
+
+BRUTE_FORCE_LIMIT = 50000   # Most assignments enumerated by brute force; larger cases use the exchange certificate
+
+# The reference Hungarian implementation loops in Python over every cell per iteration and takes
+# minutes on the larger cases, so its correctness is only checked up to this size
+CHECK_SIZE_LIMIT = {"hungarian": 32}
+
+
+def load_corpus(path):
+    """Matrices hand-entered in tests.txt as `np.array([ [...], ... ])` lines"""
+    with open(path, encoding="utf-8") as file:
+        return [np.array(ast.literal_eval(match), dtype=float)
+                for match in re.findall(r"np\.array\(\s*(\[.*\])\s*\)", file.read())]
+
+
+def generate_cases(rng, sizes):
+    """(name, cost matrix) pairs: random, tied, degenerate and rectangular, at every size"""
+    for n in sizes:
+        yield f"random {n}x{n}", rng.uniform(0, 100, (n, n))
+        yield f"integer ties {n}x{n}", rng.integers(0, 3, (n, n)).astype(float)
+        yield f"all zeros {n}x{n}", np.zeros((n, n))
+        yield f"constant {n}x{n}", np.full((n, n), 7.0)
+        yield f"large range {n}x{n}", 10.0 ** rng.uniform(-6, 9, (n, n))
+        yield f"rank one {n}x{n}", np.outer(rng.uniform(1, 10, n), rng.uniform(1, 10, n))
+        m = max(1, n // 2)
+        yield f"wide {m}x{n}", rng.uniform(0, 100, (m, n))
+        yield f"tall {n}x{m}", rng.uniform(0, 100, (n, m))
+        yield f"tied wide {m}x{n}", rng.integers(0, 3, (m, n)).astype(float)
+
+
+@contextmanager
+def time_limit(seconds):
+    """Raises TimeoutError if the block runs longer than seconds (no limit where SIGALRM is missing)"""
+    if not hasattr(signal, "SIGALRM") or seconds <= 0:
+        yield
+        return
+
+    def expire(signum, frame):
+        raise TimeoutError(f"did not finish in {seconds} s")
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def brute_force(cost_matrix):
+    """Optimal cost by trying every assignment of the smaller side"""
+    n, m = cost_matrix.shape
+    if n > m:
+        return brute_force(cost_matrix.T)
+    rows = np.arange(n)
+    return min(cost_matrix[rows, list(columns)].sum() for columns in itertools.permutations(range(m), n))
+
+
+def improving_exchange(cost_matrix, rows, cols, tolerance):
+    """Whether some cyclic or chain reassignment lowers the cost (the assignment is optimal iff not).
+
+    Bellman-Ford on the exchange graph of the assigned rows: the edge i -> k costs
+    C[i, col(k)] - C[i, col(i)] (row i takes the column of row k), and a path may
+    end on any free column. A negative cycle or path is an improving exchange.
+    """
+    n, m = cost_matrix.shape
+    if n > m:
+        return improving_exchange(cost_matrix.T, cols, rows, tolerance)
+    current = cost_matrix[rows, cols]
+    weights = cost_matrix[np.ix_(rows, cols)] - current[:, np.newaxis]
+    free = np.setdiff1d(np.arange(m), cols)
+    to_free = (cost_matrix[np.ix_(rows, free)] - current[:, np.newaxis]).min(axis=1) if len(free) else np.full(n, np.inf)
+
+    distance = np.zeros(n)
+    for _ in range(n):
+        relaxed = np.minimum(distance, (distance[:, np.newaxis] + weights).min(axis=0))
+        if np.all(relaxed >= distance - tolerance):
+            return bool(np.any(distance + to_free < -tolerance))
+        distance = relaxed
+    return True
+
+
+def check(cost_matrix, pairs):
+    """Error message for an invalid or suboptimal assignment, None when it is optimal"""
+    n, m = cost_matrix.shape
+    pairs = [(int(row), int(col)) for row, col in pairs]
+    rows = np.array([row for row, _ in pairs], dtype=int)
+    cols = np.array([col for _, col in pairs], dtype=int)
+
+    if len(pairs) != min(n, m):
+        return f"{len(pairs)} pairs, expected {min(n, m)}"
+    if np.any(rows < 0) or np.any(rows >= n) or np.any(cols < 0) or np.any(cols >= m):
+        return "index out of range"
+    if len(set(rows.tolist())) != len(rows) or len(set(cols.tolist())) != len(cols):
+        return "a row or column is assigned twice"
+
+    cost = cost_matrix[rows, cols].sum()
+    tolerance = 1e-9 * max(1.0, np.abs(cost_matrix).max())
+    if math.perm(max(n, m), min(n, m)) <= BRUTE_FORCE_LIMIT:
+        optimum = brute_force(cost_matrix)
+        if cost > optimum + tolerance * min(n, m):
+            return f"cost {cost:.6g}, optimum {optimum:.6g}"
+    elif improving_exchange(cost_matrix, rows, cols, tolerance):
+        return f"cost {cost:.6g} is not optimal (an improving exchange exists)"
+    return None
+
+
+def run_checks(cases, solvers, timeout):
+    """{solver: (checked cases, [(case, error)])}"""
+    results = {name: (0, []) for name in solvers}
+    for case, cost_matrix in cases:
+        for name in solvers:
+            if max(cost_matrix.shape) > CHECK_SIZE_LIMIT.get(name, math.inf):
+                continue
+            checked, failures = results[name]
+            results[name] = (checked + 1, failures)
+            try:
+                with time_limit(timeout):
+                    pairs = list(SOLVERS[name](cost_matrix.copy()))
+                error = check(cost_matrix, pairs)
+            except Exception as exception:
+                error = f"{type(exception).__name__}: {exception}"
+            if error is not None:
+                failures.append((case, error))
+    return results
+
+
+def measure(solve, problems):
+    """Fastest per-call time of solve(problem); each sample runs a batch of distinct problems built
+    beforehand, so the timing averages over instances and excludes their construction"""
+    samples = []
+    for batch in problems:
+        start = time.perf_counter()
+        for problem in batch:
+            list(solve(problem))
+        samples.append((time.perf_counter() - start) / len(batch))
+    return min(samples)
+
+
+def batch_size(solve, make_problem, minimum=0.005):
+    """Calls per sample so a sample lasts at least minimum seconds (sub-millisecond solves are noisy)"""
+    problem = make_problem()
+    start = time.perf_counter()
+    list(solve(problem))
+    return max(1, math.ceil(minimum / max(time.perf_counter() - start, 1e-7)))
+
+
+def timing_curve(solver, sizes, rng, repeats, limit):
+    """{n: seconds per solve} on random n x n matrices; stops at the first size slower than limit"""
+    curve = dict()
+    for n in sizes:
+        def make_problem():
+            return rng.uniform(0, 100, (n, n))
+
+        number = batch_size(solver, make_problem)
+        curve[n] = measure(solver, [[make_problem() for _ in range(number)] for _ in range(repeats)])
+        if curve[n] > limit:
+            break
+    return curve
+
+
+def warm_curve(sizes, rng, repeats, limit):
+    """{n: seconds per solve} of IncrementalAssignment re-solving after a small perturbation, as in a frame"""
+    def solve(problem):
+        solver, cost_matrix = problem
+        return solver.solve(cost_matrix, range(len(cost_matrix)), range(len(cost_matrix)))
+
+    curve = dict()
+    for n in sizes:
+        def make_problem():
+            cost_matrix = rng.uniform(0, 100, (n, n))
+            solver = IncrementalAssignment()
+            solver.solve(cost_matrix, range(n), range(n))
+            return solver, cost_matrix + rng.normal(0, 0.5, (n, n))
+
+        number = batch_size(solve, make_problem)
+        curve[n] = measure(solve, [[make_problem() for _ in range(number)] for _ in range(repeats)])
+        if curve[n] > limit:
+            break
+    return curve
+
+
+def batch_curves(batch_sizes, n, rng, repeats):
+    """{name: {B: seconds per problem}} solving B independent problems one call at a time or in one batch"""
+    def loop(problems):
+        for cost_matrix in problems:
+            list(JonkerVolgenant.solve(cost_matrix))
+        return ()
+
+    def batch(problems):
+        for pairs in BatchAssignment.solve(problems):
+            list(pairs)
+        return ()
+
+    curves = {f"jv loop {n}x{n}": dict(), f"batch {n}x{n}": dict(), f"batch ragged <={n}x{n}": dict()}
+    for size in batch_sizes:
+        stacks = [rng.uniform(0, 100, (size, n, n)) for _ in range(repeats)]
+        ragged = [[rng.uniform(0, 100, tuple(rng.integers(1, n + 1, 2))) for _ in range(size)] for _ in range(repeats)]
+        curves[f"jv loop {n}x{n}"][size] = measure(loop, [[stack] for stack in stacks]) / size
+        curves[f"batch {n}x{n}"][size] = measure(batch, [[stack] for stack in stacks]) / size
+        curves[f"batch ragged <={n}x{n}"][size] = measure(batch, [[problems] for problems in ragged]) / size
+    return curves
+
+
+def main():
+    args = benchmark_cli()
+    rng = np.random.default_rng(args.seed)
+    solvers = args.solvers
+
+    corpus = load_corpus(args.corpus)
+    cases = [(f"{args.corpus} #{k + 1}", matrix) for k, matrix in enumerate(corpus)]
+    cases += list(generate_cases(rng, [n for n in args.sizes if n <= args.check_size]))
+
+    failed = False
+    print(f"Correctness: {len(cases)} matrices ({len(corpus)} from {args.corpus}), brute force up to "
+          f"{BRUTE_FORCE_LIMIT} assignments, exchange certificate above")
+    for name, (checked, errors) in run_checks(cases, solvers, args.timeout).items():
+        skipped = f" ({len(cases) - checked} above {CHECK_SIZE_LIMIT[name]}x{CHECK_SIZE_LIMIT[name]} skipped)" if checked < len(cases) else ""
+        print(f"  {name:<12} {checked - len(errors)}/{checked} optimal{skipped}")
+        for case, error in errors:
+            print(f"    {case}: {error}")
+        failed |= bool(errors)
+
+    if "batch" in solvers:
+        errors = [(case, error) for (case, cost_matrix), pairs in zip(cases, BatchAssignment.solve([m for _, m in cases]))
+                  if (error := check(cost_matrix, list(pairs))) is not None]
+        print(f"  {'batch, all cases in one ragged call':<12} {len(cases) - len(errors)}/{len(cases)} optimal")
+        for case, error in errors:
+            print(f"    {case}: {error}")
+        failed |= bool(errors)
+
+    curves = {name: timing_curve(SOLVERS[name], args.sizes, rng, args.repeats, args.limit) for name in solvers}
+    if "incremental" in solvers:
+        curves["incremental (warm)"] = warm_curve(args.sizes, rng, args.repeats, args.limit)
+
+    print(f"\nTiming: fastest of {args.repeats} samples per size on random n x n matrices (ms per solve)")
+    print(f"{'n':>6}" + "".join(f"{name:>20}" for name in curves))
+    for n in args.sizes:
+        row = [f"{curves[name][n] * 1e3:>20.3f}" if n in curves[name] else f"{'-':>20}" for name in curves]
+        print(f"{n:>6}" + "".join(row))
+
+    if "batch" in solvers:
+        batch = batch_curves(args.batch_sizes, args.batch_n, rng, args.repeats)
+        print(f"\nBatches: B independent problems, one call each or one batched call (µs per problem)")
+        print(f"{'B':>6}" + "".join(f"{name:>24}" for name in batch))
+        for size in args.batch_sizes:
+            print(f"{size:>6}" + "".join(f"{batch[name][size] * 1e6:>24.1f}" for name in batch))
+        curves.update(batch)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        print(f"\nRegressions against {args.baseline} (slower than {args.tolerance}x):")
+        regressions = [(name, n, seconds / baseline[name][str(n)])
+                       for name, curve in curves.items() if name in baseline
+                       for n, seconds in curve.items() if str(n) in baseline[name]
+                       and seconds > args.tolerance * baseline[name][str(n)]]
+        for name, n, ratio in regressions:
+            print(f"  {name} at {n}: {ratio:.2f}x")
+        if not regressions:
+            print("  none")
+        failed |= bool(regressions)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump({name: {str(n): seconds for n, seconds in curve.items()} for name, curve in curves.items()},
+                      file, indent=2)
+        print(f"\nTiming curves saved to {args.save}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
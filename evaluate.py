@@ -0,0 +1,81 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from utils.CLI import evaluation_cli, Difficulty
+
+PERCENTILES = (1, 10, 50, 90, 99)
+
+
+def run_episode(difficulty, seed, max_steps, planner="repulsion", prediction_time=0.15, coordinator="assignment"):
+    """Runs one headless episode in its own process (and robosim instance)"""
+    from sslenv import SSLExampleEnv
+
+    env = SSLExampleEnv(render_mode=None, difficulty=difficulty, planner=planner, prediction_time=prediction_time,
+                        coordinator=coordinator)
+    env.reset(seed=seed)
+
+    start_time = time.perf_counter()
+    while not env.finished and env.steps < max_steps:
+        env.step(None)
+    wall_time = time.perf_counter() - start_time
+
+    round_steps = np.diff([0] + env.round_steps)
+    result = {
+        "seed": seed,
+        "finished": env.finished,
+        "steps": env.steps,
+        "wall_time": wall_time,
+        "sim_time": env.steps * env.time_step,
+        "round_times": (round_steps * env.time_step).tolist(),
+        "targets_collected": env.targets_collected,
+        # (robot id, simulated seconds from spawn to capture) of every collected target
+        "captures": [(robot_id, (step - spawn) * env.time_step) for step, robot_id, spawn in env.captures],
+    }
+    env.close()
+    return result
+
+
+def summarize(name, values, unit):
+    values = np.asarray(values, dtype=float)
+    if len(values) == 0:
+        return f"{name:<28}{'-':>10}"
+    columns = [np.mean(values)] + [np.percentile(values, p) for p in PERCENTILES] + [np.min(values), np.max(values)]
+    return f"{name:<28}" + "".join(f"{value:>10.3f}" for value in columns) + f"  {unit}"
+
+
+def main():
+    args = evaluation_cli()
+    difficulty = Difficulty(args.difficulty)
+    seeds = [args.seed + k for k in range(args.episodes)]
+
+    start_time = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        results = list(pool.map(run_episode, [difficulty] * len(seeds), seeds, [args.max_steps] * len(seeds),
+                                [args.planner] * len(seeds), [args.prediction_time] * len(seeds),
+                                [args.coordinator] * len(seeds)))
+    wall_time = time.perf_counter() - start_time
+
+    round_times = [t for r in results for t in r["round_times"]]
+    collection_rate = [r["targets_collected"] / r["sim_time"] for r in results if r["sim_time"] > 0]
+    episode_times = [r["sim_time"] for r in results if r["finished"]]
+    time_to_target = [t for r in results for _, t in r["captures"]]
+    throughput = [r["steps"] / r["wall_time"] for r in results if r["wall_time"] > 0]
+
+    print(f"{difficulty.name} ({args.planner}, {args.coordinator}): {len(results)} episodes, {sum(r['finished'] for r in results)} cleared all rounds, "
+          f"{wall_time:.1f} s wall time")
+    print(f"{'':<28}{'mean':>10}" + "".join(f"{'p' + str(p):>10}" for p in PERCENTILES) + f"{'min':>10}{'max':>10}")
+    print(summarize("time per round", round_times, "s (simulated)"))
+    print(summarize("targets per simulated second", collection_rate, "targets/s"))
+    print(summarize("time to target", time_to_target, "s (simulated)"))
+    robot_ids = sorted({robot_id for r in results for robot_id, _ in r["captures"]})
+    for robot_id in robot_ids:
+        times = [t for r in results for i, t in r["captures"] if i == robot_id]
+        print(summarize(f"  robot {robot_id}", times, "s (simulated)"))
+    print(summarize("time to clear all rounds", episode_times, "s (simulated)"))
+    print(summarize("throughput per worker", throughput, "steps/s"))
+
+
+if __name__ == "__main__":
+    main()
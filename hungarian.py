@@ -24,6 +24,31 @@ class Hungarian:
         zero_matrix[min_row[1], :] = False  # Remove todos os zeros da linha
         zero_matrix[:, col_index] = False  # Remove todos os zeros da coluna
 
+    # Completa a marcação gulosa até um emparelhamento máximo de zeros, por caminhos aumentantes.
+    # Sozinha, a marcação de min_zero_row pode deixar linhas sem zero marcado mesmo quando
+    # existe uma marcação completa (empates, matrizes preenchidas com zeros).
+    @staticmethod
+    def augment_zeros(matrix, marked_zeros):
+        zero_matrix = (matrix == 0)
+        row_for_col = {col: row for row, col in marked_zeros}
+        marked_rows = {row for row, _ in marked_zeros}
+
+        def augment(row, visited):
+            for col in np.flatnonzero(zero_matrix[row]):
+                if col in visited:
+                    continue
+                visited.add(col)
+                if col not in row_for_col or augment(row_for_col[col], visited):
+                    row_for_col[col] = row
+                    return True
+            return False
+
+        for row in range(matrix.shape[0]):
+            if row not in marked_rows and augment(row, set()):
+                marked_rows.add(row)
+
+        marked_zeros[:] = sorted((row, int(col)) for col, row in row_for_col.items())
+
     # Marca zeros na matriz e identifica linhas e colunas a serem cobertas
     @staticmethod
     def mark_matrix(matrix):
@@ -35,6 +60,7 @@ class Hungarian:
         # Marcar zeros válidos
         while np.any(zero_matrix):  # Continua enquanto existirem zeros na matriz
             Hungarian.min_zero_row(zero_matrix, marked_zeros)
+        Hungarian.augment_zeros(matrix, marked_zeros)
 
         # Identificar linhas e colunas a serem cobertas
         marked_zero_rows = {row for row, _ in marked_zeros}  # Linhas com zeros marcados
@@ -117,6 +143,7 @@ class Hungarian:
         marked_zeros = []
         while np.any(zero_matrix):  # Enquanto existirem zeros na matriz
             Hungarian.min_zero_row(zero_matrix, marked_zeros)
+        Hungarian.augment_zeros(cost_matrix, marked_zeros)
 
         row_indices, col_indices = zip(*marked_zeros)  # Extrai as linhas e colunas das marcações
 
@@ -126,3 +153,358 @@ class Hungarian:
         valid_indices = (row_indices < num_rows) & (col_indices < num_cols)
 
         return zip(row_indices[valid_indices], col_indices[valid_indices])
+
+
+# Implementação vetorizada (NumPy) do algoritmo de caminho aumentante mínimo
+# no estilo Jonker-Volgenant (LAPJV) para o problema de atribuição linear.
+# Mantém a mesma API de Hungarian.solve, mas opera diretamente sobre matrizes
+# retangulares (sem preenchimento com zeros) e custa O(n^2 * m) no pior caso.
+class JonkerVolgenant:
+    # Tolerância usada ao comparar custos reduzidos em ponto flutuante
+    EPSILON = 1e-9
+
+    # Inicialização por redução de colunas (apenas para matrizes quadradas).
+    # Cada coluna recebe o menor custo como potencial dual e, se possível,
+    # é atribuída à linha que realiza esse mínimo.
+    @staticmethod
+    def column_reduction(cost_matrix, u, v, col4row, row4col):
+        min_rows = np.argmin(cost_matrix, axis=0)
+        v[:] = cost_matrix[min_rows, np.arange(cost_matrix.shape[1])]
+        u[:] = 0.0
+
+        # Linhas que aparecem como mínimo de alguma coluna recebem a primeira delas
+        rows, first_cols = np.unique(min_rows, return_index=True)
+        col4row[rows] = first_cols
+        row4col[first_cols] = rows
+
+    # Encontra o caminho aumentante de menor custo reduzido a partir de uma linha livre
+    # (Dijkstra sobre as colunas, vetorizado) e atualiza potenciais duais e atribuição.
+    @staticmethod
+    def augment(cost_matrix, u, v, col4row, row4col, cur_row):
+        num_cols = cost_matrix.shape[1]
+        shortest = np.full(num_cols, np.inf)  # Menor custo reduzido até cada coluna
+        path = np.full(num_cols, -1)          # Linha predecessora de cada coluna no caminho
+        visited_cols = np.zeros(num_cols, dtype=bool)
+        visited_rows = []
+
+        min_value = 0.0
+        row = cur_row
+        sink = -1
+        while sink == -1:
+            visited_rows.append(row)
+
+            # Relaxa todas as colunas ainda não visitadas de uma só vez
+            reduced = min_value + cost_matrix[row] - u[row] - v
+            improved = ~visited_cols & (reduced < shortest)
+            shortest[improved] = reduced[improved]
+            path[improved] = row
+
+            candidates = np.where(visited_cols, np.inf, shortest)
+            col = int(np.argmin(candidates))
+            min_value = candidates[col]
+            if min_value == np.inf:
+                raise ValueError("cost matrix is infeasible")
+
+            # Em caso de empate, prefere uma coluna livre (encerra o caminho mais cedo)
+            free_ties = (candidates == min_value) & (row4col < 0)
+            if free_ties.any():
+                col = int(np.argmax(free_ties))
+
+            visited_cols[col] = True
+            if row4col[col] < 0:
+                sink = col
+            else:
+                row = row4col[col]
+
+        # Atualiza os potenciais duais das linhas e colunas visitadas
+        u[cur_row] += min_value
+        other_rows = np.array(visited_rows[1:], dtype=int)
+        if len(other_rows) > 0:
+            u[other_rows] += min_value - shortest[col4row[other_rows]]
+        v[visited_cols] -= min_value - shortest[visited_cols]
+
+        # Inverte as atribuições ao longo do caminho encontrado
+        col = sink
+        while True:
+            row = path[col]
+            row4col[col] = row
+            col4row[row], col = col, col4row[row]
+            if row == cur_row:
+                break
+
+    # Resolve o problema de atribuição linear e retorna os pares (linha, coluna),
+    # com a mesma interface de Hungarian.solve.
+    @staticmethod
+    def solve(cost_matrix):
+        cost_matrix = np.asarray(cost_matrix, dtype=float)
+        num_rows, num_cols = cost_matrix.shape
+        if num_rows == 0 or num_cols == 0:
+            return zip(np.array([], dtype=int), np.array([], dtype=int))
+
+        # O algoritmo atribui todas as linhas, logo exige linhas <= colunas
+        transposed = num_rows > num_cols
+        if transposed:
+            cost_matrix = cost_matrix.T
+            num_rows, num_cols = num_cols, num_rows
+
+        u = np.zeros(num_rows)
+        v = np.zeros(num_cols)
+        col4row = np.full(num_rows, -1)
+        row4col = np.full(num_cols, -1)
+
+        # Em matrizes retangulares as colunas livres precisam manter potencial zero,
+        # então a redução de colunas só é usada no caso quadrado.
+        if num_rows == num_cols:
+            JonkerVolgenant.column_reduction(cost_matrix, u, v, col4row, row4col)
+
+        for cur_row in np.flatnonzero(col4row < 0):
+            JonkerVolgenant.augment(cost_matrix, u, v, col4row, row4col, cur_row)
+
+        return JonkerVolgenant.pairs(col4row, transposed)
+
+    # Converte a atribuição col4row (na orientação linhas <= colunas) em pares (linha, coluna)
+    @staticmethod
+    def pairs(col4row, transposed):
+        row_indices = np.arange(len(col4row))
+        col_indices = col4row
+        if transposed:
+            row_indices, col_indices = col_indices, row_indices
+            order = np.argsort(row_indices)
+            row_indices, col_indices = row_indices[order], col_indices[order]
+
+        return zip(row_indices, col_indices)
+
+
+# Motor de atribuição incremental: guarda os potenciais duais e o emparelhamento
+# do frame anterior e apenas os repara quando a matriz de custos muda pouco
+# (robôs se movem alguns milímetros, um alvo some, um robô entra na equipe).
+# Em regime permanente custa O(n * m) por frame em vez de resolver do zero.
+class IncrementalAssignment:
+    def __init__(self):
+        self.row_ids = []
+        self.col_ids = []
+        self.transposed = False
+        self.v = np.zeros(0)
+        self.col4row = np.full(0, -1)
+
+    # Descarta o estado guardado (o próximo solve começa do zero)
+    def reset(self):
+        self.__init__()
+
+    # Resolve a atribuição reaproveitando o estado do frame anterior.
+    # row_ids e col_ids identificam cada linha/coluna entre frames (ex.: ID do robô e o alvo).
+    def solve(self, cost_matrix, row_ids, col_ids):
+        cost_matrix = np.asarray(cost_matrix, dtype=float)
+        num_rows, num_cols = cost_matrix.shape
+        if num_rows == 0 or num_cols == 0:
+            self.reset()
+            return zip(np.array([], dtype=int), np.array([], dtype=int))
+
+        transposed = num_rows > num_cols
+        if transposed:
+            cost_matrix = cost_matrix.T
+            row_ids, col_ids = col_ids, row_ids
+            num_rows, num_cols = num_cols, num_rows
+        row_ids, col_ids = list(row_ids), list(col_ids)
+
+        u = np.zeros(num_rows)
+        v = np.zeros(num_cols)
+        col4row = np.full(num_rows, -1)
+        row4col = np.full(num_cols, -1)
+
+        warm = (transposed == self.transposed and len(self.row_ids) > 0
+                and len(set(row_ids)) == num_rows and len(set(col_ids)) == num_cols)
+        if warm:
+            self.warm_start(cost_matrix, row_ids, col_ids, u, v, col4row, row4col)
+        elif num_rows == num_cols:
+            JonkerVolgenant.column_reduction(cost_matrix, u, v, col4row, row4col)
+
+        for cur_row in np.flatnonzero(col4row < 0):
+            JonkerVolgenant.augment(cost_matrix, u, v, col4row, row4col, cur_row)
+
+        self.row_ids, self.col_ids = row_ids, col_ids
+        self.transposed = transposed
+        self.v, self.col4row = v, col4row
+        return JonkerVolgenant.pairs(col4row, transposed)
+
+    # Recupera potenciais e emparelhamento do frame anterior para os IDs que continuam
+    # presentes e desfaz apenas os pares que deixaram de ser justos (custo reduzido > 0).
+    def warm_start(self, cost_matrix, row_ids, col_ids, u, v, col4row, row4col):
+        prev_cols = {col_id: j for j, col_id in enumerate(self.col_ids)}
+        new_cols = {col_id: j for j, col_id in enumerate(col_ids)}
+
+        # Potenciais das colunas que continuam presentes (colunas novas começam em zero)
+        for j, col_id in enumerate(col_ids):
+            if col_id in prev_cols:
+                v[j] = self.v[prev_cols[col_id]]
+
+        # Pares do frame anterior cujas linha e coluna continuam presentes
+        prev_rows = {row_id: i for i, row_id in enumerate(self.row_ids)}
+        for i, row_id in enumerate(row_ids):
+            prev_i = prev_rows.get(row_id)
+            if prev_i is None or self.col4row[prev_i] < 0:
+                continue
+            j = new_cols.get(self.col_ids[self.col4row[prev_i]])
+            if j is not None:
+                col4row[i], row4col[j] = j, i
+
+        # Em matrizes retangulares os potenciais das colunas não podem ser positivos.
+        # Deslocar todos por uma constante não altera quais pares são justos.
+        rectangular = len(col4row) < len(row4col)
+        if rectangular:
+            v -= max(np.max(v), 0.0)
+
+        # Pares que deixaram de ser o mínimo da sua linha (os robôs se moveram) voltam a
+        # ser justos elevando o potencial da coluna pareada pela folga em relação à
+        # melhor alternativa. Com variações pequenas isso quase nunca afeta outras linhas.
+        matched = np.flatnonzero(col4row >= 0)
+        if len(matched) > 0 and cost_matrix.shape[1] > 1:
+            matched_cols = col4row[matched]
+            reduced = cost_matrix[matched] - v
+            matched_reduced = reduced[np.arange(len(matched)), matched_cols]
+            reduced[np.arange(len(matched)), matched_cols] = np.inf
+            v[matched_cols] += np.maximum(matched_reduced - np.min(reduced, axis=1), 0.0)
+            if rectangular:
+                v[matched_cols] = np.minimum(v[matched_cols], 0.0)
+
+        # Repara a viabilidade dual: colunas livres voltam a potencial zero, cada linha
+        # recebe o menor custo reduzido e pares que deixaram de ser justos são desfeitos.
+        rows = np.arange(len(col4row))
+        while True:
+            if rectangular:
+                v[row4col < 0] = 0.0
+            u[:] = np.min(cost_matrix - v, axis=1)
+
+            matched = col4row >= 0
+            slack = cost_matrix[rows[matched], col4row[matched]] - u[matched] - v[col4row[matched]]
+            loose = rows[matched][slack > JonkerVolgenant.EPSILON]
+            if len(loose) == 0:
+                break
+            row4col[col4row[loose]] = -1
+            col4row[loose] = -1
+
+
+# Resolve uma pilha de problemas de atribuição independentes numa única chamada (por exemplo,
+# um por ambiente de um VectorEnv). É o mesmo caminho aumentante mínimo do JonkerVolgenant,
+# mas cada passo do Dijkstra é feito ao mesmo tempo em todos os problemas da pilha, então o
+# número de iterações em Python depende do tamanho dos problemas e não da quantidade deles.
+class BatchAssignment:
+    # Aceita uma matriz (B, n, m), com `shapes` opcional (B, 2) indicando o bloco válido
+    # (linhas, colunas) de cada problema preenchido, ou uma lista de matrizes de tamanhos
+    # diferentes. Retorna uma lista com os pares (linha, coluna) de cada problema, com a
+    # mesma interface de JonkerVolgenant.solve.
+    @staticmethod
+    def solve(cost_matrices, shapes=None):
+        if isinstance(cost_matrices, np.ndarray) and cost_matrices.ndim == 3:
+            if shapes is None:
+                shapes = np.broadcast_to(cost_matrices.shape[1:], (len(cost_matrices), 2))
+            problems = [matrix[:rows, :cols] for matrix, (rows, cols) in zip(cost_matrices, shapes)]
+        else:
+            problems = [np.asarray(matrix, dtype=float) for matrix in cost_matrices]
+        if len(problems) == 0:
+            return []
+
+        # O algoritmo atribui todas as linhas, logo cada problema é orientado com linhas <= colunas
+        transposed = [matrix.shape[0] > matrix.shape[1] for matrix in problems]
+        problems = [matrix.T if flip else matrix for matrix, flip in zip(problems, transposed)]
+        num_rows = np.array([matrix.shape[0] for matrix in problems], dtype=int)
+        num_cols = np.array([matrix.shape[1] for matrix in problems], dtype=int)
+
+        # Preenchimento: colunas inexistentes custam infinito e nunca entram num caminho
+        batch, rows, cols = len(problems), num_rows.max(), max(num_cols.max(), 1)
+        cost = np.full((batch, rows, cols), np.inf)
+        for b, matrix in enumerate(problems):
+            cost[b, :matrix.shape[0], :matrix.shape[1]] = matrix
+
+        u = np.zeros((batch, rows))
+        v = np.zeros((batch, cols))
+        col4row = np.full((batch, rows), -1)
+        row4col = np.full((batch, cols), -1)
+        BatchAssignment.column_reduction(cost, v, col4row, row4col, np.flatnonzero(num_rows == num_cols))
+        for cur_row in range(rows):
+            active = np.flatnonzero((cur_row < num_rows) & (col4row[:, cur_row] < 0))
+            BatchAssignment.augment(cost, u, v, col4row, row4col, cur_row, active)
+
+        pairs = []
+        for b in range(batch):
+            assignment = col4row[b, :num_rows[b]]
+            pairs.append(JonkerVolgenant.pairs(assignment, transposed[b]))
+        return pairs
+
+    # Redução de colunas de JonkerVolgenant.column_reduction nos problemas quadrados da pilha
+    # (nos retangulares as colunas livres precisam manter potencial zero). O bloco preenchido
+    # de cada problema é infinito, então só as colunas válidas recebem potencial e atribuição.
+    @staticmethod
+    def column_reduction(cost, v, col4row, row4col, square):
+        if len(square) == 0:
+            return
+        block = cost[square]
+        valid = np.isfinite(block).any(axis=1)                          # (S, cols)
+        min_rows = np.argmin(block, axis=1)
+        v[square] = np.where(valid, np.take_along_axis(block, min_rows[:, np.newaxis, :], axis=1)[:, 0], 0.0)
+
+        # Cada linha que é o mínimo de alguma coluna recebe a primeira delas
+        is_min = (min_rows[:, np.newaxis, :] == np.arange(block.shape[1])[:, np.newaxis]) & valid[:, np.newaxis, :]
+        has_col = is_min.any(axis=2)
+        first_col = np.argmax(is_min, axis=2)
+        b, r = np.nonzero(has_col)
+        col4row[square[b], r] = first_col[b, r]
+        row4col[square[b], first_col[b, r]] = r
+
+    # Um caminho aumentante a partir da linha cur_row em cada problema de `active`, com o
+    # Dijkstra de JonkerVolgenant.augment avançando uma coluna por iteração em todos eles.
+    @staticmethod
+    def augment(cost, u, v, col4row, row4col, cur_row, active):
+        batch, rows, cols = cost.shape
+        shortest = np.full((batch, cols), np.inf)
+        path = np.full((batch, cols), -1)
+        visited_cols = np.zeros((batch, cols), dtype=bool)
+        visited_rows = np.zeros((batch, rows), dtype=bool)
+        min_value = np.zeros(batch)
+        row = np.full(batch, cur_row)
+        sink = np.full(batch, -1)
+
+        searching = active
+        while len(searching) > 0:
+            b, r = searching, row[searching]
+            visited_rows[b, r] = True
+
+            # Relaxa todas as colunas ainda não visitadas de cada problema de uma só vez
+            reduced = min_value[b, np.newaxis] + cost[b, r] - u[b, r][:, np.newaxis] - v[b]
+            improved = ~visited_cols[b] & (reduced < shortest[b])
+            shortest[b] = np.where(improved, reduced, shortest[b])
+            path[b] = np.where(improved, r[:, np.newaxis], path[b])
+
+            candidates = np.where(visited_cols[b], np.inf, shortest[b])
+            col = np.argmin(candidates, axis=1)
+            min_value[b] = candidates[np.arange(len(b)), col]
+            if np.any(min_value[b] == np.inf):
+                raise ValueError("cost matrix is infeasible")
+
+            # Em caso de empate, prefere uma coluna livre (encerra o caminho mais cedo)
+            free_ties = (candidates == min_value[b, np.newaxis]) & (row4col[b] < 0)
+            col = np.where(free_ties.any(axis=1), np.argmax(free_ties, axis=1), col)
+
+            visited_cols[b, col] = True
+            free = row4col[b, col] < 0
+            sink[b[free]] = col[free]
+            row[b[~free]] = row4col[b[~free], col[~free]]
+            searching = b[~free]
+
+        # Atualiza os potenciais duais das linhas e colunas visitadas
+        b = active
+        u[b, cur_row] += min_value[b]
+        visited_rows[b, cur_row] = False
+        matched_col = np.where(col4row[b] >= 0, col4row[b], 0)
+        u[b] += np.where(visited_rows[b], min_value[b, np.newaxis] - np.take_along_axis(shortest[b], matched_col, axis=1), 0.0)
+        v[b] -= np.where(visited_cols[b], min_value[b, np.newaxis] - shortest[b], 0.0)
+
+        # Inverte as atribuições ao longo do caminho encontrado em cada problema
+        col = sink[b]
+        while len(b) > 0:
+            r = path[b, col]
+            row4col[b, col] = r
+            previous = col4row[b, r]
+            col4row[b, r] = col
+            pending = r != cur_row
+            b, col = b[pending], previous[pending]
@@ -2,6 +2,8 @@ from rsoccer_gym.Entities import Robot
 from utils.ssl.Navigation import Navigation
 from utils.Point import Point
 from utils.ssl.base_agent import BaseAgent
+from utils.Profiler import Profiler
+import numpy as np
 import random
 
 class RandomAgent(BaseAgent):
@@ -24,3 +26,30 @@ class RandomAgent(BaseAgent):
 
     def post_decision(self):
         pass
+
+    @staticmethod
+    def step_batch(agents, robots, opponents, targets, keep_targets=False):
+        """Steps many RandomAgents with a single Navigation.goToPointBatch call.
+
+        Equivalent to calling agents[k].step(robots[k], opponents, dict(), targets[k], keep_targets)
+        for every k, and returns the commands in the same order.
+        """
+        with Profiler.section("RandomAgent.observe"):
+            for agent, robot, agent_targets in zip(agents, robots, targets):
+                agent.observe(robot, opponents, dict(), agent_targets, keep_targets)
+
+        moving = [agent for agent in agents if len(agent.targets) > 0]
+        if len(moving) == 0:
+            return [agent.command() for agent in agents]
+
+        with Profiler.section("RandomAgent.goToPointBatch"):
+            poses = np.array([(a.robot.x, a.robot.y, a.robot.theta) for a in moving])
+            goals = np.array([(a.targets[0].x, a.targets[0].y) for a in moving])
+            velocities, angle_velocities = Navigation.goToPointBatch(poses, goals)
+            velocities *= np.array([a.vel_mult for a in moving])[:, np.newaxis]
+
+        for agent, velocity, angle_velocity in zip(moving, velocities.tolist(), angle_velocities.tolist()):
+            agent.set_vel(Point(*velocity))
+            agent.set_angle_vel(angle_velocity)
+
+        return [agent.command() for agent in agents]
@@ -0,0 +1,63 @@
+import time
+
+import pygame
+from rsoccer_gym.Render import COLORS, Ball, SSLRobot
+
+from utils.CLI import replay_cli
+from utils.EpisodeRecorder import EpisodeReplay
+from utils.ssl.small_field import SSLHRenderField
+
+
+def draw(screen, field_renderer, replay, k):
+    def pos_transform(pos_x, pos_y):
+        return (
+            int(pos_x * field_renderer.scale + field_renderer.center_x),
+            int(pos_y * field_renderer.scale + field_renderer.center_y),
+        )
+
+    frame = replay.frame(k)
+    field_renderer.draw(screen)
+
+    for robots, color in ((frame.robots_blue, COLORS["BLUE"]), (frame.robots_yellow, COLORS["YELLOW"])):
+        for robot in robots.values():
+            x, y = pos_transform(robot.x, robot.y)
+            SSLRobot(x, y, robot.theta, field_renderer.scale, robot.id, color).draw(screen)
+
+    Ball(*pos_transform(frame.ball.x, frame.ball.y), field_renderer.scale).draw(screen)
+
+    for target in replay.targets(k):
+        pygame.draw.circle(screen, (255, 0, 255), pos_transform(target.x, target.y), 0.09 * field_renderer.scale, 2)
+
+
+def main():
+    args = replay_cli()
+    replay = EpisodeReplay(args.path)
+
+    if not args.render:
+        start_time = time.perf_counter()
+        for k in range(len(replay)):
+            replay.frame(k)
+            replay.targets(k)
+        wall_time = time.perf_counter() - start_time
+        print(f"{len(replay)} frames ({len(replay) * replay.time_step:.2f} s simulated) "
+              f"read in {wall_time:.3f} s: {len(replay) / max(wall_time, 1e-9):.0f} frames/s")
+        return
+
+    field_renderer = SSLHRenderField()
+    pygame.init()
+    pygame.display.set_caption("SSL Environment - Replay")
+    screen = pygame.display.set_mode(field_renderer.window_size)
+    clock = pygame.time.Clock()
+
+    for k in range(len(replay)):
+        if any(event.type == pygame.QUIT for event in pygame.event.get()):
+            break
+        draw(screen, field_renderer, replay, k)
+        pygame.display.update()
+        clock.tick(args.fps)
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,18 +2,28 @@ import numpy as np
 from gymnasium.spaces import Box
 from rsoccer_gym.Entities import Ball, Frame, Robot
 from rsoccer_gym.ssl.ssl_gym_base import SSLBaseEnv
-from rsoccer_gym.Utils import KDTree
 from utils.Point import Point
-from utils.FixedQueue import FixedQueue
+from utils.PointArray import PointArray
+from utils.FixedQueue import PointQueue
+from utils.SpatialIndex import SpatialIndex
+from utils.PoissonDisk import PoissonDiskSampler
+from utils.ssl.PathPlanner import AStarPlanner
+from utils.ssl.VelocityObstacles import ReciprocalVelocityObstacles
+from utils.WorldSnapshot import WorldSnapshot
+from utils.MotionPredictor import MotionPredictor
+from utils.Profiler import Profiler
 from utils.ssl.small_field import SSLHRenderField
+from rsoccer_gym.Render import COLORS, Ball as RenderBall, SSLRobot
 from agent import ExampleAgent
+from assignment import AssignmentCoordinator, EventDrivenCoordinator, TourCoordinator
 from random_agent import RandomAgent
 import random
 import pygame
 from utils.CLI import Difficulty
 
 class SSLExampleEnv(SSLBaseEnv):
-    def __init__(self, render_mode="human", difficulty=Difficulty.EASY):
+    def __init__(self, render_mode="human", difficulty=Difficulty.EASY, render_every=1, planner="repulsion",
+                 prediction_time=0.15, prediction_smoothing=0.0, coordinator="assignment"):
         field = 2   # 1: SSL Div B    2: SSL Software challenge
         super().__init__(
             field_type=field, 
@@ -29,29 +39,198 @@ class SSLExampleEnv(SSLBaseEnv):
         self.observation_space = Box(low=-self.field.length/2,\
             high=self.field.length/2,shape=(n_obs, ))
         
-        self.targets = []
         self.min_dist = 0.18
-        self.all_points = FixedQueue(max(4, self.max_targets))
-        self.robots_paths = [FixedQueue(40) for i in range(11)]
-
-        self.rounds = self.max_rounds  ## because of the first round
-        self.targets_per_round = 1
-
-        self.my_agents     = {0: ExampleAgent(0, False)}
-        self.blue_agents   = {i: RandomAgent(i, False) for i in range(1, 11)}
-        self.yellow_agents = {i: RandomAgent(i, True) for i in range(0, 11)}
+        # Team task allocation: "assignment" gives each robot one target (JV) re-solved every tick, "events"
+        # re-solves it only on captures, spawns, new robots or cost drift, and "tours" gives each robot
+        # an ordered tour of targets and aims it at the first one
+        if coordinator == "assignment":
+            self.coordinator = AssignmentCoordinator()
+        elif coordinator == "events":
+            self.coordinator = EventDrivenCoordinator()
+        elif coordinator == "tours":
+            self.coordinator = TourCoordinator()
+        else:
+            raise ValueError(f"unknown coordinator {coordinator!r}, expected 'assignment', 'events' or 'tours'")
+        self.spatial_index = SpatialIndex(cell_size=0.35)
+        # Obstacle positions prediction_time seconds ahead, computed once per frame for every ExampleAgent
+        self.predictor     = MotionPredictor(horizon=1.0, resolution=0.1, smoothing=prediction_smoothing,
+                                             lookahead=prediction_time)
+
+        # Initial robot placement over the same area x() and y() draw from
+        self.placement = PoissonDiskSampler(
+            (-self.field.length/2 + self.min_dist, self.field.length/2 - self.min_dist),
+            (-self.field.width/2 + self.min_dist, self.field.width/2 - self.min_dist),
+            self.min_dist)
+
+        # Obstacle avoidance of my_agents: "repulsion" keeps the agents' repulsion vectors, "astar" shares
+        # a path planner and "orca" corrects the whole team's velocities at once after the agents decide
+        self.planner = None
+        self.velocity_obstacles = None
+        if planner == "astar":
+            self.planner = AStarPlanner(
+                (-self.field.length/2, self.field.length/2), (-self.field.width/2, self.field.width/2))
+        elif planner == "orca":
+            self.velocity_obstacles = ReciprocalVelocityObstacles(time_step=self.time_step)
+        elif planner != "repulsion":
+            raise ValueError(f"unknown planner {planner!r}, expected 'repulsion', 'astar' or 'orca'")
+
+        # Per-env random stream for targets, initial positions and opponent targets.
+        # Seed it through reset(seed=...) to reproduce an episode.
+        self.rng = random.Random()
+        self.recorder = None  # Optional EpisodeRecorder fed on every step
+        self.video    = None  # Optional VideoRecorder fed with every drawn frame
+
+        self._init_episode()
 
         self.gen_target_prob = 0.003
 
         if field == 2:
             self.field_renderer = SSLHRenderField()
             self.window_size = self.field_renderer.window_size
+
+        # In human mode only every render_every-th physics step is drawn (and paced by render_fps)
+        self.render_every = max(1, int(render_every))
+        self.background = None  # Static field, drawn once on the first render
+        self.drawn_rects = []   # Screen areas covered by the moving layers on the last drawn frame
+        self.dirty_rects = []   # Areas to push to the display on the next update
         
+    def _init_episode(self):
+        self.targets = []
+        self.target_steps = []  # Step at which each target in self.targets was spawned
+        self.all_points = PointQueue(max(4, self.max_targets))
+        self.robots_paths = [PointQueue(40) for i in range(11)]
+
+        self.rounds = self.max_rounds  ## because of the first round
+        self.targets_per_round = 1
+        self.finished = False  # True once every round of the difficulty has been cleared
+
+        # Episode statistics
+        self.round_steps = []  # Step at which each round was cleared
+        self.targets_collected = 0
+        self.captures = []  # (step, robot id, spawn step) of every collected target
+
+        self.coordinator.update(dict(), [])
+        self.predictor.reset()
+        if self.planner is not None:
+            self.planner.reset()
+        self.my_agents     = {0: self._new_agent(0)}
+        self.blue_agents   = {i: RandomAgent(i, False) for i in range(1, 11)}
+        self.yellow_agents = {i: RandomAgent(i, True) for i in range(0, 11)}
+
+    def _new_agent(self, id):
+        return ExampleAgent(id, False, self.coordinator, self.spatial_index, self.planner,
+                            repulsion=self.velocity_obstacles is None, predictor=self.predictor)
+
+    def reset(self, *, seed=None, options=None):
+        if seed is not None:
+            self.rng.seed(seed)
+        self._init_episode()
+        return super().reset(seed=seed, options=options)
+
+    def step(self, action):
+        result = super().step(action)
+        if self.recorder is not None:
+            self.recorder.record(self.frame, self.targets, self.sent_commands)
+        if self.video is not None and self.steps % self.render_every == 0 and self.video.wants_frame():
+            with Profiler.section("env.video"):
+                self.video.push(self._capture_frame())
+        return result
+
+    def _capture_frame(self):
+        # Human mode already drew this step in SSLBaseEnv.step; rgb_array draws on demand
+        if self.render_mode == "rgb_array":
+            self._draw_frame()
+        # One contiguous (H, W, 3) copy, cheaper than going through surfarray
+        width, height = self.window_surface.get_size()
+        pixels = pygame.image.tostring(self.window_surface, "RGB")
+        return np.frombuffer(pixels, dtype=np.uint8).reshape(height, width, 3)
+
+    def close(self):
+        # An encoding error is re-raised by the recorder, but the simulator and window must still close
+        try:
+            if self.video is not None:
+                self.video.close()
+        finally:
+            super().close()
+
     def _frame_to_observations(self):
         ball, robot = self.frame.ball, self.frame.robots_blue[0]
-        return np.array([ball.x, ball.y, robot.x, robot.y])
+        return np.array([ball.x, ball.y, robot.x, robot.y], dtype=np.float32)
 
     def _get_commands(self, actions):
+        # One read-only snapshot of the frame; agents get views over it instead of dict copies
+        with Profiler.section("env.snapshot"):
+            self.snapshot = WorldSnapshot(self.frame, self.n_robots_blue)
+
+        # Predicted positions of every robot over the next second, queried by every ExampleAgent
+        with Profiler.section("env.prediction"):
+            self.predictor.update(self.snapshot)
+
+        with Profiler.section("env.targets"):
+            self._update_targets()
+
+        with Profiler.section("env.obstacles"):
+            obstacles = self.snapshot.view()
+            teammates = self.snapshot.view(ids=self.my_agents.keys())
+
+            # Radius queries over the robots' predicted positions, shared by every ExampleAgent
+            self.spatial_index.build(self.snapshot.ids, self.predictor.predicted)
+
+        # Solve the team assignment once per frame, shared by every ExampleAgent
+        with Profiler.section("env.assignment"):
+            self.coordinator.update(teammates, self.targets)
+
+        myActions = []
+        with Profiler.section("env.my_agents"):
+            for i in self.my_agents.keys():
+                action = self.my_agents[i].step(self.frame.robots_blue[i], self.snapshot.view(exclude=i), teammates, self.targets)
+                myActions.append(action)
+
+        if self.velocity_obstacles is not None:
+            with Profiler.section("env.orca"):
+                self._avoid_collisions(myActions)
+
+        others_actions = []
+        if self.DYNAMIC_OBSTACLES:
+            with Profiler.section("env.opponents"):
+                others = [(agent, self.frame.robots_blue[i]) for i, agent in self.blue_agents.items()]
+                others += [(agent, self.frame.robots_yellow[i]) for i, agent in self.yellow_agents.items()]
+
+                random_targets = []
+                for _ in others:
+                    random_target = []
+                    if self.rng.uniform(0.0, 1.0) < self.gen_target_prob:
+                        random_target.append(Point(x=self.x(), y=self.y()))
+                    random_targets.append(random_target)
+
+                # One vectorized control pass for every opponent agent
+                others_actions = RandomAgent.step_batch(
+                    [agent for agent, _ in others], [robot for _, robot in others], obstacles, random_targets, True)
+
+        return myActions + others_actions
+
+    def _avoid_collisions(self, commands):
+        """Replaces the my_agents commands' velocities by ORCA's collision-free ones, all robots at once"""
+        ids = np.array([command.id for command in commands])
+        rows = np.array([self.snapshot.rows[id] for id in ids.tolist()])
+        theta = np.radians(self.snapshot.theta[rows])
+        cos, sin = np.cos(theta), np.sin(theta)
+
+        # Commands are in each robot's frame (Navigation.global_to_local_velocity); ORCA works in the field frame
+        local = np.array([(command.v_x, command.v_y) for command in commands])
+        preferred = np.stack((local[:, 0] * cos - local[:, 1] * sin, local[:, 0] * sin + local[:, 1] * cos), axis=1)
+
+        velocities = self.velocity_obstacles.solve(
+            self.snapshot.positions[rows], self.snapshot.velocities[rows], preferred,
+            self.snapshot.positions, self.snapshot.velocities,
+            cooperative=np.isin(self.snapshot.ids, ids),
+            exclude=self.snapshot.ids[np.newaxis] == ids[:, np.newaxis])
+
+        local = np.stack((velocities[:, 0] * cos + velocities[:, 1] * sin, -velocities[:, 0] * sin + velocities[:, 1] * cos), axis=1)
+        for command, (v_x, v_y) in zip(commands, local.tolist()):
+            command.v_x, command.v_y = v_x, v_y
+
+    def _update_targets(self):
         # Keep only the last M target points
         for target in self.targets:
             if target not in self.all_points:
@@ -61,105 +240,109 @@ class SSLExampleEnv(SSLBaseEnv):
         for i in self.my_agents:
             self.robots_paths[i].push(Point(self.frame.robots_blue[i].x, self.frame.robots_blue[i].y))
 
-        # Check if the robot is close to the target
-        for j in range(len(self.targets) - 1, -1, -1):
-            for i in self.my_agents:
-                if Point(self.frame.robots_blue[i].x, self.frame.robots_blue[i].y).dist_to(self.targets[j]) < self.min_dist:
-                    self.targets.pop(j)
-                    break
+        # Check if the robot is close to the target: one robot x target distance threshold
+        if len(self.targets) > 0:
+            view = self.snapshot.view(ids=self.my_agents.keys())
+            robots = PointArray(view.positions)
+            captured = robots.pairwise_dist(PointArray.from_points(self.targets)) < self.min_dist
+            hit = captured.any(axis=0)
+
+            # The first controlled robot within reach is credited with the capture; rows follow the view's ids
+            for j in np.flatnonzero(hit):
+                robot_id = int(view.ids[int(np.argmax(captured[:, j]))])
+                self.captures.append((self.steps, robot_id, self.target_steps[j]))
+            self.targets_collected += int(hit.sum())
+
+            self.targets = [target for target, h in zip(self.targets, hit) if not h]
+            self.target_steps = [step for step, h in zip(self.target_steps, hit) if not h]
         
         # Check if there are no more targets
         if len(self.targets) == 0:
             self.rounds -= 1
+            self.round_steps.append(self.steps)
 
         # Finish the phase and increase the number of targets for the next phase
         if self.rounds == 0:
+            if self.targets_per_round >= self.max_targets:
+                self.finished = True
             self.rounds = self.max_rounds
             if self.targets_per_round < self.max_targets:
                 self.targets_per_round += 1
                 self.blue_agents.pop(len(self.my_agents))
-                self.my_agents[len(self.my_agents)] = ExampleAgent(len(self.my_agents), False)
+                self.my_agents[len(self.my_agents)] = self._new_agent(len(self.my_agents))
 
         # Generate new targets
         if len(self.targets) == 0:
             for i in range(self.targets_per_round):
                 self.targets.append(Point(self.x(), self.y()))
-        
-        obstacles = {id: robot for id, robot in self.frame.robots_blue.items()}
-        for i in range(0, self.n_robots_yellow):
-            obstacles[i + self.n_robots_blue] = self.frame.robots_yellow[i]
-        teammates = {id: self.frame.robots_blue[id] for id in self.my_agents.keys()}
-
-        remove_self = lambda robots, selfId: {id: robot for id, robot in robots.items() if id != selfId}
-
-        myActions = []
-        for i in self.my_agents.keys():
-            action = self.my_agents[i].step(self.frame.robots_blue[i], remove_self(obstacles, i), teammates, self.targets)
-            myActions.append(action)
-
-        others_actions = []
-        if self.DYNAMIC_OBSTACLES:
-            for i in self.blue_agents.keys():
-                random_target = []
-                if random.uniform(0.0, 1.0) < self.gen_target_prob:
-                    random_target.append(Point(x=self.x(), y=self.y()))
-                    
-                others_actions.append(self.blue_agents[i].step(self.frame.robots_blue[i], obstacles, dict(), random_target, True))
-
-            for i in self.yellow_agents.keys():
-                random_target = []
-                if random.uniform(0.0, 1.0) < self.gen_target_prob:
-                    random_target.append(Point(x=self.x(), y=self.y()))
-
-                others_actions.append(self.yellow_agents[i].step(self.frame.robots_yellow[i], obstacles, dict(), random_target, True))
-
-        return myActions + others_actions
+                self.target_steps.append(self.steps)
 
     def _calculate_reward_and_done(self):
-        return 0, False
+        # The episode terminates once every round of the difficulty has been cleared
+        return 0, self.finished
     
     def x(self):
-        return random.uniform(-self.field.length/2 + self.min_dist, self.field.length/2 - self.min_dist)
+        return self.rng.uniform(-self.field.length/2 + self.min_dist, self.field.length/2 - self.min_dist)
 
     def y(self):
-        return random.uniform(-self.field.width/2 + self.min_dist, self.field.width/2 - self.min_dist)
+        return self.rng.uniform(-self.field.width/2 + self.min_dist, self.field.width/2 - self.min_dist)
     
     def _get_initial_positions_frame(self):
-
-        def theta():
-            return random.uniform(0, 360)
-    
         pos_frame: Frame = Frame()
 
         pos_frame.ball = Ball(x=self.x(), y=self.y())
 
-        pos_frame.robots_blue[0] = Robot(x=self.x(), y=self.y(), theta=theta())
-
         self.targets = [Point(x=self.x(), y=self.y())]
+        self.target_steps = [0]
 
-        places = KDTree()
-        places.insert((pos_frame.ball.x, pos_frame.ball.y))
+        # Robots min_dist apart from each other and from the ball, drawn from the env's random stream
+        rng = np.random.default_rng(self.rng.getrandbits(64))
+        n_robots = self.n_robots_blue + self.n_robots_yellow
+        positions = self.placement.sample(n_robots, rng, fixed=[(pos_frame.ball.x, pos_frame.ball.y)]).tolist()
+        thetas = rng.uniform(0, 360, size=n_robots).tolist()
 
         for i in range(self.n_robots_blue):
-            pos = (self.x(), self.y())
-            while places.get_nearest(pos)[1] < self.min_dist:
-                pos = (self.x(), self.y())
-
-            places.insert(pos)
-            pos_frame.robots_blue[i] = Robot(x=pos[0], y=pos[1], theta=theta())
-        
+            pos_frame.robots_blue[i] = Robot(x=positions[i][0], y=positions[i][1], theta=thetas[i])
 
         for i in range(0, self.n_robots_yellow):
-            pos = (self.x(), self.y())
-            while places.get_nearest(pos)[1] < self.min_dist:
-                pos = (self.x(), self.y())
-
-            places.insert(pos)
-            pos_frame.robots_yellow[i] = Robot(x=pos[0], y=pos[1], theta=theta())
+            k = self.n_robots_blue + i
+            pos_frame.robots_yellow[i] = Robot(x=positions[k][0], y=positions[k][1], theta=thetas[k])
 
         return pos_frame
     
 
+    def render(self):
+        if self.render_mode == "human" and self.steps % self.render_every != 0:
+            return None
+
+        self._draw_frame()
+
+        if self.render_mode == "human":
+            pygame.event.pump()
+            pygame.display.update(self.dirty_rects)
+            self.clock.tick(self.metadata["render_fps"])
+        elif self.render_mode == "rgb_array":
+            return np.transpose(
+                np.array(pygame.surfarray.pixels3d(self.window_surface)), axes=(1, 0, 2)
+            )
+
+    def _draw_frame(self):
+        if self.window_surface is None:
+            pygame.init()
+
+            if self.render_mode == "human":
+                pygame.display.init()
+                pygame.display.set_caption("SSL Environment")
+                self.window_surface = pygame.display.set_mode(self.window_size)
+            elif self.render_mode == "rgb_array":
+                self.window_surface = pygame.Surface(self.window_size)
+
+        if self.clock is None:
+            self.clock = pygame.time.Clock()
+
+        with Profiler.section("env.render"):
+            self._render()
+
     def _render(self):
         def pos_transform(pos_x, pos_y):
             return (
@@ -167,27 +350,57 @@ class SSLExampleEnv(SSLBaseEnv):
                 int(pos_y * self.field_renderer.scale + self.field_renderer.center_y),
             )
 
-        super()._render()
-        
+        if self.background is None:
+            self.background = pygame.Surface(self.window_size)
+            self.field_renderer.draw(self.background)
+            self.window_surface.blit(self.background, (0, 0))
+            self.drawn_rects = [self.window_surface.get_rect()]
+        else:
+            # Erase only what the moving layers covered on the last drawn frame
+            for rect in self.drawn_rects:
+                self.window_surface.blit(self.background, rect, rect)
+
+        scale = self.field_renderer.scale
+        # Bounding box of a rotated SSLRobot sprite plus its direction line
+        robot_side = int(np.ceil(2 * SSLRobot.size * scale * np.sqrt(2))) + 2
+        drawn = []
+
+        for robots, color in ((self.frame.robots_blue, COLORS["BLUE"]), (self.frame.robots_yellow, COLORS["YELLOW"])):
+            for robot in robots.values():
+                x, y = pos_transform(robot.x, robot.y)
+                SSLRobot(x, y, robot.theta, scale, robot.id, color).draw(self.window_surface)
+                drawn.append(pygame.Rect(0, 0, robot_side, robot_side).move(x - robot_side // 2, y - robot_side // 2))
+
+        ball = RenderBall(*pos_transform(self.frame.ball.x, self.frame.ball.y), scale)
+        ball.draw(self.window_surface)
+        drawn.append(pygame.Rect(ball.x - ball.radius - 1, ball.y - ball.radius - 1, 2 * ball.radius + 3, 2 * ball.radius + 3))
+
         for target in self.targets:
-            self.draw_target(
+            drawn.append(self.draw_target(
                 self.window_surface,
                 pos_transform,
                 target,
                 (255, 0, 255),
-            )
+            ))
+
+        # Transform every stored point at once from the queues' ordered views
+        center = np.array([self.field_renderer.center_x, self.field_renderer.center_y])
 
         if len(self.all_points) > 0:
-            my_path = [pos_transform(*p) for p in self.all_points]
+            my_path = (self.all_points.view() * scale + center).astype(int).tolist()
             for point in my_path:
-                pygame.draw.circle(self.window_surface, (255, 0, 0), point, 3)
+                drawn.append(pygame.draw.circle(self.window_surface, (255, 0, 0), point, 3))
         
         for i in range(len(self.robots_paths)):
             if len(self.robots_paths[i]) > 1:
-                my_path = [pos_transform(*p) for p in self.robots_paths[i]]
-                pygame.draw.lines(self.window_surface, (255, 0, 0), False, my_path, 1)
+                my_path = (self.robots_paths[i].view() * scale + center).astype(int).tolist()
+                drawn.append(pygame.draw.lines(self.window_surface, (255, 0, 0), False, my_path, 1))
+
+        # The display needs both the erased areas and the newly drawn ones
+        self.dirty_rects = self.drawn_rects + drawn
+        self.drawn_rects = drawn
 
     def draw_target(self, screen, transformer, point, color):
         x, y = transformer(point.x, point.y)
         size = 0.09 * self.field_renderer.scale
-        pygame.draw.circle(screen, color, (x, y), size, 2)
\ No newline at end of file
+        return pygame.draw.circle(screen, color, (x, y), size, 2)
\ No newline at end of file
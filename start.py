@@ -3,34 +3,80 @@ import rsoccer_gym
 from gymnasium.envs.registration import register
 from utils.CLI import cli, Difficulty
 import pygame
+import time
+from utils.EpisodeRecorder import EpisodeRecorder
+from utils.VideoRecorder import VideoRecorder
+from utils.Profiler import Profiler
+from vector_env import register_envs
 
 args = cli()
+Profiler.enable(args.profile)
 
 register(
     id="VSS-Project",
     entry_point="vssenv:ExampleEnv"
 )
 
-register(
-    id="SSL-Project",
-    entry_point="sslenv:SSLExampleEnv"
-)
+register_envs()
+
+if args.headless:
+    # Headless recording still has to draw the frames, just off screen
+    render_mode = "rgb_array" if args.video else None
+else:
+    render_mode = "human"
+env = gym.make("SSL-Project", difficulty=Difficulty(args.difficulty), render_mode=render_mode,
+               render_every=args.render_every, planner=args.planner,
+               prediction_time=args.prediction_time, coordinator=args.coordinator)
 
-env = gym.make("SSL-Project", difficulty=Difficulty(args.difficulty))
+if args.record:
+    env.unwrapped.recorder = EpisodeRecorder(difficulty=args.difficulty, seed=args.seed)
 
-env.reset()
+if args.video:
+    # Real-time playback: one video frame per drawn step
+    fps = 1 / (env.unwrapped.time_step * env.unwrapped.render_every)
+    env.unwrapped.video = VideoRecorder(args.video, fps=fps)
 
+env.reset(seed=args.seed)
+
+start_time = time.perf_counter()
 for i in range(1):
     terminated = False
     truncated = False
     while not (terminated or truncated):
         # Step using random actions
         action = env.action_space.sample()
-        next_state, reward, terminated, _, _ = env.step(action)
+        # The env reports termination once every round is cleared (vector envs reset on it); here the
+        # rendered run stays open as before until the window is closed, and headless runs check finished
+        next_state, reward, _, _, _ = env.step(action)
+
+        if args.headless:
+            if env.unwrapped.finished or env.unwrapped.steps >= args.max_steps:
+                break
+            continue
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 terminated = True
                 break
-            
-    env.close()
\ No newline at end of file
+
+    if args.headless:
+        wall_time = time.perf_counter() - start_time
+        steps = env.unwrapped.steps
+        status = "cleared all rounds" if env.unwrapped.finished else f"stopped after --max-steps={args.max_steps}"
+        print(f"{Difficulty(args.difficulty).name}: {status}")
+        print(f"  steps:          {steps}")
+        print(f"  wall time:      {wall_time:.2f} s")
+        print(f"  simulated time: {steps * env.unwrapped.time_step:.2f} s")
+        print(f"  throughput:     {steps / wall_time:.1f} steps/s")
+
+    if args.record:
+        env.unwrapped.recorder.save(args.record)
+
+    if args.profile:
+        Profiler.dump()
+
+    env.close()
+
+    if args.video:
+        video = env.unwrapped.video
+        print(f"video: {video.written} frames written to {args.video}, {video.dropped} dropped")
@@ -0,0 +1,30 @@
+import pytest
+
+from assignment import AssignmentCoordinator, EventDrivenCoordinator, TourCoordinator
+from utils.Point import Point
+
+COORDINATORS = [AssignmentCoordinator, EventDrivenCoordinator, TourCoordinator]
+
+
+class Robot:
+    def __init__(self, x, y, theta=0.0):
+        self.x, self.y, self.theta = x, y, theta
+
+
+@pytest.mark.parametrize("coordinator", COORDINATORS)
+def test_no_targets_assigns_nothing(coordinator):
+    assert coordinator().update({0: Robot(0.0, 0.0)}, []) == {}
+
+
+@pytest.mark.parametrize("coordinator", COORDINATORS)
+def test_empty_team_assigns_nothing(coordinator):
+    assert coordinator().update({}, [Point(1.0, 1.0)]) == {}
+
+
+@pytest.mark.parametrize("coordinator", COORDINATORS)
+def test_each_robot_gets_its_nearest_target(coordinator):
+    teammates = {0: Robot(-1.0, 0.0), 1: Robot(1.0, 0.0)}
+    targets = [Point(1.2, 0.1), Point(-1.2, -0.1)]
+    instance = coordinator()
+    assert instance.update(teammates, targets) == {0: targets[1], 1: targets[0]}
+    assert instance.target_for(0) == targets[1] and instance.target_for(2) is None
@@ -0,0 +1,23 @@
+import numpy as np
+
+from utils.ssl.VelocityObstacles import ReciprocalVelocityObstacles
+
+
+def solve(positions, preferred):
+    positions = np.asarray(positions, dtype=float)
+    velocities = np.zeros_like(positions)
+    return ReciprocalVelocityObstacles().solve(positions, velocities, np.asarray(preferred, dtype=float), positions,
+                                               velocities, cooperative=np.ones(len(positions), dtype=bool),
+                                               exclude=np.eye(len(positions), dtype=bool))
+
+
+def test_unobstructed_robot_keeps_preferred_velocity():
+    # 3 m apart, beyond neighbour_distance: no half-plane is active
+    preferred = [[0.6, 0.0], [0.0, -0.3]]
+    np.testing.assert_array_equal(solve([[0.0, 0.0], [3.0, 0.0]], preferred), preferred)
+
+
+def test_head_on_robots_turn_to_the_same_side():
+    velocity = solve([[0.0, 0.0], [1.0, 0.0]], [[0.6, 0.0], [-0.6, 0.0]])
+    # Both turn the same way relative to their heading, so they pass each other
+    assert velocity[0, 1] > 0 and velocity[1, 1] < 0
@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+from rsoccer_gym.Entities import Frame, Robot
+
+from utils.WorldSnapshot import WorldSnapshot
+
+
+@pytest.fixture
+def snapshot():
+    frame = Frame()
+    frame.robots_blue = {0: Robot(id=0, x=0.0, y=0.0, theta=0.0), 1: Robot(id=1, x=1.0, y=0.5, theta=90.0, v_x=0.2)}
+    frame.robots_yellow = {0: Robot(yellow=True, id=0, x=-1.0, y=0.0, theta=0.0)}
+    return WorldSnapshot(frame, n_robots_blue=2)
+
+
+def test_yellow_ids_are_offset_by_the_blue_team_size(snapshot):
+    np.testing.assert_array_equal(snapshot.ids, [0, 1, 2])
+    np.testing.assert_array_equal(snapshot.view(exclude=1).positions, [[0.0, 0.0], [-1.0, 0.0]])
+
+
+@pytest.mark.parametrize("field", ["positions", "velocities", "x", "y", "theta", "v_x", "v_y", "v_theta"])
+def test_field_arrays_are_read_only(snapshot, field):
+    with pytest.raises(ValueError):
+        getattr(snapshot, field)[0] = 5.0
@@ -20,6 +20,37 @@ class Difficulty(Enum):
             return True, 6, 2
 
 
+def _add_agent_options(parser):
+    # Shared by cli() and evaluation_cli(), so interactive and evaluation runs accept the same agent options
+    parser.add_argument(
+        '--planner',
+        type=str,
+        choices=('repulsion', 'astar', 'orca'),
+        default='repulsion',
+        help='Obstacle avoidance: repulsion vectors, A* path planning with cached paths or ORCA velocity obstacles / Default = repulsion')
+
+    parser.add_argument(
+        '--coordinator',
+        type=str,
+        choices=('assignment', 'events', 'tours'),
+        default='assignment',
+        help='Target allocation: one target per robot re-solved every tick (assignment) or only on events and cost drift (events), '
+             'or ordered target tours per robot (tours) / Default = assignment')
+
+    parser.add_argument(
+        '--prediction-time',
+        type=float,
+        default=0.15,
+        metavar='SECONDS',
+        help='Obstacle positions are avoided where they are predicted to be this far ahead / Default = 0.15')
+
+    parser.add_argument(
+        '--max-steps',
+        type=int,
+        default=20000,
+        help='Headless episodes are given up after this many steps / Default = 20000')
+
+
 def cli():
     parser = argparse.ArgumentParser(
         prog='RobôCIn Software Challenge', 
@@ -39,4 +70,241 @@ def cli():
         default=1, 
         help='Difficulties: 1, 2, 3 or 4 / Default = 1')
 
-    return parser.parse_args()
\ No newline at end of file
+    parser.add_argument(
+        '--headless',
+        action='store_true',
+        help='Run without rendering at full speed and report throughput once every round is cleared')
+
+    _add_agent_options(parser)
+
+    parser.add_argument(
+        '--render-every',
+        type=int,
+        default=1,
+        metavar='K',
+        help='Draw only every K-th physics step, so watching a run slows it down less / Default = 1')
+
+    parser.add_argument(
+        '-s',
+        '--seed',
+        type=int,
+        default=None,
+        help='Seed for targets, initial positions and opponents / Default = random')
+
+    parser.add_argument(
+        '--record',
+        type=str,
+        default=None,
+        metavar='PATH',
+        help='Record every step of the episode into a compressed .npz file')
+
+    parser.add_argument(
+        '--video',
+        type=str,
+        default=None,
+        metavar='PATH',
+        help='Encode the drawn frames to an MP4 file on a background thread (works with --headless too)')
+
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Measure per-phase latencies of the control loop and print them at the end')
+
+    return parser.parse_args()
+
+
+def evaluation_cli():
+    parser = argparse.ArgumentParser(
+        prog='RobôCIn Software Challenge - Evaluation',
+        description='Runs many seeded headless episodes in parallel and summarizes them.')
+
+    parser.add_argument(
+        '-d', 
+        '--difficulty', 
+        type=int, 
+        default=1, 
+        help='Difficulties: 1, 2, 3 or 4 / Default = 1')
+
+    parser.add_argument(
+        '-n',
+        '--episodes',
+        type=int,
+        default=100,
+        help='Number of episodes / Default = 100')
+
+    parser.add_argument(
+        '-w',
+        '--workers',
+        type=int,
+        default=None,
+        help='Worker processes / Default = number of cores')
+
+    parser.add_argument(
+        '-s',
+        '--seed',
+        type=int,
+        default=0,
+        help='Base seed, episode k uses seed + k / Default = 0')
+
+    _add_agent_options(parser)
+
+    return parser.parse_args()
+
+
+def replay_cli():
+    parser = argparse.ArgumentParser(
+        prog='RobôCIn Software Challenge - Replay',
+        description='Plays back an episode recorded with start.py --record, without robosim.')
+
+    parser.add_argument(
+        'path',
+        type=str,
+        help='Recorded .npz episode')
+
+    parser.add_argument(
+        '--render',
+        action='store_true',
+        help='Draw the episode with pygame instead of reading it through as fast as possible')
+
+    parser.add_argument(
+        '--fps',
+        type=int,
+        default=40,
+        help='Playback rate with --render / Default = 40 (real time)')
+
+    return parser.parse_args()
+
+
+def vector_cli():
+    parser = argparse.ArgumentParser(
+        prog='RobôCIn Software Challenge - Vectorized environments',
+        description='Measures the throughput of SSL-Project under gymnasium vector environments.')
+
+    parser.add_argument(
+        '-d',
+        '--difficulty',
+        type=int,
+        default=4,
+        help='Difficulties: 1, 2, 3 or 4 / Default = 4')
+
+    parser.add_argument(
+        '-n',
+        '--num-envs',
+        type=int,
+        nargs='+',
+        default=[1, 4],
+        help='Number of copies stepping in lockstep, one measurement per value / Default = 1 4')
+
+    parser.add_argument(
+        '--sync',
+        action='store_true',
+        help='Use SyncVectorEnv (one process) instead of AsyncVectorEnv (one subprocess per env)')
+
+    parser.add_argument(
+        '--steps',
+        type=int,
+        default=1000,
+        help='Vector steps per measurement / Default = 1000')
+
+    parser.add_argument(
+        '-s',
+        '--seed',
+        type=int,
+        default=0,
+        help='Base seed, env k uses seed + k / Default = 0')
+
+    return parser.parse_args()
+
+
+def benchmark_cli():
+    parser = argparse.ArgumentParser(
+        prog='RobôCIn Software Challenge - Assignment benchmark',
+        description='Checks the assignment solvers for optimality on tests.txt and generated matrices '
+                    'and records their timing curves.')
+
+    parser.add_argument(
+        '--solvers',
+        type=str,
+        nargs='+',
+        choices=('hungarian', 'jv', 'incremental', 'batch'),
+        default=['hungarian', 'jv', 'incremental', 'batch'],
+        help='Solvers to check and time / Default = all')
+
+    parser.add_argument(
+        '--corpus',
+        type=str,
+        default='tests.txt',
+        help='File with hand-entered np.array([...]) matrices / Default = tests.txt')
+
+    parser.add_argument(
+        '--sizes',
+        type=int,
+        nargs='+',
+        default=[2, 3, 4, 6, 8, 16, 32, 64, 128, 256, 500],
+        help='Matrix sizes n for the generated cases and the timing curves / Default = 2 3 4 6 8 16 32 64 128 256 500')
+
+    parser.add_argument(
+        '--batch-sizes',
+        type=int,
+        nargs='+',
+        default=[1, 10, 100, 500],
+        help='Numbers B of independent problems solved per call in the batch timing / Default = 1 10 100 500')
+
+    parser.add_argument(
+        '--batch-n',
+        type=int,
+        default=6,
+        help='Size of the batched problems (ragged ones are up to n x n) / Default = 6, a full VERY_HARD team')
+
+    parser.add_argument(
+        '--check-size',
+        type=int,
+        default=500,
+        help='Largest generated size checked for optimality / Default = 500')
+
+    parser.add_argument(
+        '--timeout',
+        type=float,
+        default=10.0,
+        help='Seconds before a solve counts as not terminating / Default = 10')
+
+    parser.add_argument(
+        '--repeats',
+        type=int,
+        default=5,
+        help='Timing samples per size, the fastest is kept / Default = 5')
+
+    parser.add_argument(
+        '--limit',
+        type=float,
+        default=2.0,
+        help='A solver is not timed on larger sizes once a solve takes longer than this (s) / Default = 2')
+
+    parser.add_argument(
+        '--save',
+        type=str,
+        default=None,
+        metavar='PATH',
+        help='Write the timing curves to a JSON file')
+
+    parser.add_argument(
+        '--baseline',
+        type=str,
+        default=None,
+        metavar='PATH',
+        help='Compare the timing curves with a JSON file from --save and fail on regressions')
+
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=2.0,
+        help='Slowdown factor over the baseline reported as a regression / Default = 2')
+
+    parser.add_argument(
+        '-s',
+        '--seed',
+        type=int,
+        default=0,
+        help='Seed of the generated matrices / Default = 0')
+
+    return parser.parse_args()
@@ -0,0 +1,105 @@
+import numpy as np
+from rsoccer_gym.Entities import Ball, Frame, Robot
+from utils.Point import Point
+
+# Per-robot columns stored for every frame
+ROBOT_FIELDS = ("x", "y", "theta", "v_x", "v_y", "v_theta")
+COMMAND_FIELDS = ("v_x", "v_y", "v_theta")
+
+
+class EpisodeRecorder:
+    """Records every step of an episode into growable NumPy arrays.
+
+    Each recorded step stores the frame returned by the simulator, the targets
+    the agents were chasing and the commands that produced that frame. Robots
+    are indexed blue 0..n_blue-1 then yellow; robots without a command get NaN.
+    save() writes everything to a single compressed .npz file.
+    """
+
+    def __init__(self, n_robots_blue=11, n_robots_yellow=11, time_step=0.025, capacity=4096, **metadata):
+        self.n_robots_blue = n_robots_blue
+        self.n_robots_yellow = n_robots_yellow
+        self.time_step = time_step
+        self.metadata = metadata
+        self.count = 0
+
+        n_robots = n_robots_blue + n_robots_yellow
+        self.robots = np.zeros((capacity, n_robots, len(ROBOT_FIELDS)), dtype=np.float32)
+        self.commands = np.full((capacity, n_robots, len(COMMAND_FIELDS)), np.nan, dtype=np.float32)
+        self.ball = np.zeros((capacity, 2), dtype=np.float32)
+        self.target_offsets = [0]
+        self.target_points = []
+
+    def _grow(self):
+        self.robots = np.concatenate((self.robots, np.zeros_like(self.robots)))
+        self.commands = np.concatenate((self.commands, np.full_like(self.commands, np.nan)))
+        self.ball = np.concatenate((self.ball, np.zeros_like(self.ball)))
+
+    def record(self, frame: Frame, targets, commands):
+        if self.count == len(self.robots):
+            self._grow()
+        k = self.count
+
+        for i, robot in frame.robots_blue.items():
+            self.robots[k, i] = [getattr(robot, field) or 0.0 for field in ROBOT_FIELDS]
+        for i, robot in frame.robots_yellow.items():
+            self.robots[k, self.n_robots_blue + i] = [getattr(robot, field) or 0.0 for field in ROBOT_FIELDS]
+        self.ball[k] = (frame.ball.x, frame.ball.y)
+
+        for command in commands or []:
+            row = command.id + (self.n_robots_blue if command.yellow else 0)
+            self.commands[k, row] = [getattr(command, field) for field in COMMAND_FIELDS]
+
+        self.target_points.extend((t.x, t.y) for t in targets)
+        self.target_offsets.append(len(self.target_points))
+        self.count += 1
+
+    def save(self, path):
+        np.savez_compressed(
+            path,
+            robots=self.robots[:self.count],
+            commands=self.commands[:self.count],
+            ball=self.ball[:self.count],
+            target_points=np.array(self.target_points, dtype=np.float32).reshape(-1, 2),
+            target_offsets=np.array(self.target_offsets, dtype=np.int64),
+            n_robots=np.array([self.n_robots_blue, self.n_robots_yellow]),
+            time_step=np.array(self.time_step),
+            metadata=np.array(repr(self.metadata)),
+        )
+
+
+class EpisodeReplay:
+    """Read-only access to an episode saved by EpisodeRecorder, without robosim."""
+
+    def __init__(self, path):
+        data = np.load(path)
+        self.robots = data["robots"]
+        self.commands = data["commands"]
+        self.ball = data["ball"]
+        self.target_points = data["target_points"]
+        self.target_offsets = data["target_offsets"]
+        self.n_robots_blue, self.n_robots_yellow = (int(n) for n in data["n_robots"])
+        self.time_step = float(data["time_step"])
+        self.metadata = str(data["metadata"])
+
+    def __len__(self):
+        return len(self.robots)
+
+    def targets(self, k):
+        """Targets chased at step k, as a list of Point"""
+        points = self.target_points[self.target_offsets[k]:self.target_offsets[k + 1]]
+        return [Point(float(x), float(y)) for x, y in points]
+
+    def frame(self, k) -> Frame:
+        """Rebuilds the rsoccer Frame of step k"""
+        frame = Frame()
+        frame.ball = Ball(x=float(self.ball[k, 0]), y=float(self.ball[k, 1]))
+        for row, values in enumerate(self.robots[k].tolist()):
+            yellow = row >= self.n_robots_blue
+            id = row - self.n_robots_blue if yellow else row
+            robot = Robot(id=id, yellow=yellow, **dict(zip(ROBOT_FIELDS, values)))
+            if yellow:
+                frame.robots_yellow[id] = robot
+            else:
+                frame.robots_blue[id] = robot
+        return frame
@@ -1,3 +1,7 @@
+import numpy as np
+from utils.Point import Point
+
+
 class FixedQueue:
     def __init__(self, size):
         self.size = size
@@ -45,4 +49,73 @@ class FixedQueue:
             if self.queue[idx] == item:
                 return True
             idx = (idx + 1) % self.size
-        return False
\ No newline at end of file
+        return False
+
+class PointQueue:
+    """FixedQueue of 2-D points backed by a NumPy ring buffer.
+
+    Every point is written twice (at slot i and i + size), so the items in
+    queue order are always the contiguous slice buffer[head:head + count] and
+    view() returns them without copying. A multiset of the stored coordinates
+    makes membership O(1).
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.buffer = np.zeros((2 * size, 2))
+        self.head = 0
+        self.count = 0
+        self.index = dict()  # {(x, y): number of stored copies}
+
+    def _forget(self, key):
+        remaining = self.index[key] - 1
+        if remaining == 0:
+            del self.index[key]
+        else:
+            self.index[key] = remaining
+
+    def push(self, item):
+        key = (float(item[0]), float(item[1]))
+        if self.count == self.size:
+            self._forget(self._key(self.head))
+            self.head = (self.head + 1) % self.size
+        else:
+            self.count += 1
+
+        tail = (self.head + self.count - 1) % self.size
+        self.buffer[tail] = key
+        self.buffer[tail + self.size] = key
+        self.index[key] = self.index.get(key, 0) + 1
+
+    def pop(self):
+        if self.count == 0:
+            return None
+        item = self[0]
+        self._forget((item.x, item.y))
+        self.head = (self.head + 1) % self.size
+        self.count -= 1
+        return item
+
+    def _key(self, slot):
+        return (float(self.buffer[slot, 0]), float(self.buffer[slot, 1]))
+
+    def view(self) -> np.ndarray:
+        """Read-only (count, 2) view of the points in queue order (oldest first)"""
+        ordered = self.buffer[self.head:self.head + self.count]
+        ordered.flags.writeable = False
+        return ordered
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, key):
+        if key < 0 or key >= self.count:
+            raise IndexError("Index out of range")
+        return Point(*self._key(self.head + key))
+
+    def __iter__(self):
+        for x, y in self.view().tolist():
+            yield Point(x, y)
+
+    def __contains__(self, item):
+        return (float(item[0]), float(item[1])) in self.index
@@ -0,0 +1,54 @@
+import numpy as np
+from utils.WorldSnapshot import WorldSnapshot
+
+
+class MotionPredictor:
+    """Per-frame table of predicted robot positions, shared by every agent.
+
+    update() extrapolates every robot of a WorldSnapshot at constant velocity
+    over `horizon` seconds in steps of `resolution`, once per frame, into an
+    (R, H, 2) table whose rows follow the snapshot's. With smoothing > 0 the
+    velocity is an exponential moving average over the recent frames instead
+    of the last measured one, which filters out the jitter of robots that keep
+    switching targets. The positions `lookahead` seconds ahead, the ones agents
+    avoid, are interpolated from the table once in update() into `predicted`;
+    agents only index into `current` and `predicted` and never recompute them.
+    """
+
+    def __init__(self, horizon=1.0, resolution=0.1, smoothing=0.0, lookahead=0.15):
+        self.times = np.arange(0.0, horizon + resolution / 2, resolution)
+        self.resolution = resolution
+        self.smoothing = smoothing  # Weight of the previous estimate, 0 uses the current velocity only
+        self.lookahead = lookahead  # Seconds ahead of the positions stored in `predicted`
+        self.reset()
+
+    def reset(self):
+        self.snapshot = None
+        self.velocities = None   # (R, 2) velocities used for the table
+        self.table = np.zeros((0, len(self.times), 2))
+        self.current = np.zeros((0, 2))    # (R, 2) positions of the frame
+        self.predicted = np.zeros((0, 2))  # (R, 2) positions lookahead seconds ahead
+        self._history = dict()   # {robot id: smoothed velocity}
+
+    def update(self, snapshot: WorldSnapshot):
+        velocities = snapshot.velocities
+        if self.smoothing > 0:
+            previous = np.array([self._history.get(id, velocity) for id, velocity
+                                 in zip(snapshot.ids.tolist(), velocities.tolist())]).reshape(-1, 2)
+            velocities = self.smoothing * previous + (1 - self.smoothing) * velocities
+            self._history = dict(zip(snapshot.ids.tolist(), velocities.tolist()))
+
+        self.snapshot = snapshot
+        self.velocities = velocities
+        self.table = snapshot.positions[:, np.newaxis, :] + self.times[np.newaxis, :, np.newaxis] * velocities[:, np.newaxis, :]
+        self.table.flags.writeable = False
+        self.current = self.table[:, 0]
+        self.predicted = self.at(self.lookahead)
+        self.predicted.flags.writeable = False
+
+    def at(self, time) -> np.ndarray:
+        """(R, 2) positions predicted `time` seconds ahead, interpolated between table columns"""
+        k = np.clip(time / self.resolution, 0, len(self.times) - 1)
+        low = int(np.floor(k))
+        high = min(low + 1, len(self.times) - 1)
+        return self.table[:, low] + (k - low) * (self.table[:, high] - self.table[:, low])
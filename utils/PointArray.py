@@ -0,0 +1,92 @@
+import numpy as np
+from utils.Point import Point
+
+
+class PointArray:
+    """Batch of 2-D points backed by an (N, 2) float array.
+
+    Mirrors the Point API element-wise: operands may be another PointArray of
+    the same length, a single Point (broadcast) or, for * and /, a scalar or an
+    (N,) array. Scalar results (length, dist_to, dot, angle) are (N,) arrays.
+    """
+
+    __slots__ = ("xy",)
+
+    def __init__(self, xy):
+        self.xy = np.asarray(xy, dtype=float).reshape(-1, 2)
+
+    @staticmethod
+    def from_points(points) -> "PointArray":
+        return PointArray([(p.x, p.y) for p in points])
+
+    def to_points(self) -> list:
+        return [Point(x, y) for x, y in self.xy.tolist()]
+
+    @staticmethod
+    def _coords(other):
+        if isinstance(other, PointArray):
+            return other.xy
+        if isinstance(other, Point):
+            return np.array((other.x, other.y))
+        return np.asarray(other, dtype=float)
+
+    @staticmethod
+    def _scalars(value):
+        value = np.asarray(value, dtype=float)
+        return value[:, np.newaxis] if value.ndim == 1 else value
+
+    @property
+    def x(self) -> np.ndarray:
+        return self.xy[:, 0]
+
+    @property
+    def y(self) -> np.ndarray:
+        return self.xy[:, 1]
+
+    def __len__(self):
+        return len(self.xy)
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            return Point(*self.xy[key].tolist())
+        return PointArray(self.xy[key])
+
+    def __iter__(self):
+        return iter(self.to_points())
+
+    def __add__(self, other):
+        return PointArray(self.xy + self._coords(other))
+
+    def __sub__(self, other):
+        return PointArray(self.xy - self._coords(other))
+
+    def __mul__(self, scalar):
+        return PointArray(self.xy * self._scalars(scalar))
+
+    def __truediv__(self, scalar):
+        return PointArray(self.xy / self._scalars(scalar))
+
+    def __str__(self):
+        return "[" + ", ".join(str(p) for p in self.to_points()) + "]"
+
+    def length(self) -> np.ndarray:
+        return np.hypot(self.xy[:, 0], self.xy[:, 1])
+
+    def dist_to(self, other) -> np.ndarray:
+        delta = self.xy - self._coords(other)
+        return np.hypot(delta[:, 0], delta[:, 1])
+
+    def dot(self, other) -> np.ndarray:
+        return np.sum(self.xy * self._coords(other), axis=-1)
+
+    def angle(self) -> np.ndarray:
+        return np.arctan2(self.xy[:, 1], self.xy[:, 0])
+
+    def normalize(self) -> "PointArray":
+        return self / self.length()
+
+    def pairwise_dist(self, other=None) -> np.ndarray:
+        """(N, M) matrix of distances from every point here to every point of other (self by default)"""
+        other_xy = self.xy if other is None else self._coords(other).reshape(-1, 2)
+        delta = self.xy[:, np.newaxis, :] - other_xy[np.newaxis, :, :]
+        return np.hypot(delta[..., 0], delta[..., 1])
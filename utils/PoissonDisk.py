@@ -0,0 +1,101 @@
+import numpy as np
+
+
+class PoissonDiskSampler:
+    """Places points at least min_dist apart inside a rectangle, in bounded time.
+
+    Points are inserted one at a time and vectorized over frames: each gets up
+    to `attempts` uniform candidates, checked against a background grid with
+    cells of min_dist / sqrt(2) (so a cell holds at most one point and only the
+    5x5 neighbouring cells need checking). A point whose candidates all miss,
+    which only happens in crowded layouts, is drawn Bridson-style from the
+    annuli [min_dist, 2 min_dist] around that frame's points. If even that finds
+    no room the layout is treated as full and ValueError is raised, so the
+    work is bounded and never spins.
+    """
+
+    # Neighbouring cells that can hold a point closer than min_dist
+    OFFSETS = np.array([(dx, dy) for dx in range(-2, 3) for dy in range(-2, 3)])
+
+    def __init__(self, x_range, y_range, min_dist, attempts=30):
+        self.low = np.array([x_range[0], y_range[0]], dtype=float)
+        self.high = np.array([x_range[1], y_range[1]], dtype=float)
+        self.min_dist = min_dist
+        self.attempts = attempts
+        self.cell = min_dist / np.sqrt(2)
+        self.shape = tuple(np.floor((self.high - self.low) / self.cell).astype(int) + 1)
+
+    def sample(self, n, rng: np.random.Generator, fixed=()) -> np.ndarray:
+        """(n, 2) points, min_dist apart from each other and from the fixed points"""
+        return self.sample_batch(1, n, rng, np.asarray(fixed, dtype=float).reshape(-1, 2))[0]
+
+    def sample_batch(self, frames, n, rng: np.random.Generator, fixed=None) -> np.ndarray:
+        """(frames, n, 2) independent layouts; fixed is (m, 2) or (frames, m, 2) and must itself be min_dist apart"""
+        fixed = np.zeros((0, 2)) if fixed is None else np.asarray(fixed, dtype=float)
+        m = fixed.shape[-2]
+        fixed = np.broadcast_to(fixed, (frames, m, 2))
+
+        points = np.full((frames, m + n, 2), np.nan)
+        grid = np.full((frames,) + self.shape, -1, dtype=int)  # Index into points, -1 when empty
+        rows = np.arange(frames)
+
+        for i in range(m):
+            self._insert(grid, points, rows, i, fixed[:, i])
+
+        for i in range(m, m + n):
+            chosen = np.empty((frames, 2))
+            pending = rows
+            # A couple of candidates place almost every point; only the misses pay for the remaining attempts
+            for k in (min(2, self.attempts), self.attempts - min(2, self.attempts)):
+                if len(pending) == 0 or k == 0:
+                    continue
+                candidates = rng.uniform(self.low, self.high, size=(len(pending), k, 2))
+                free = self._free(grid, points, pending[:, np.newaxis], candidates)
+                placed = free.any(axis=1)
+                chosen[pending[placed]] = candidates[placed, np.argmax(free[placed], axis=1)]
+                pending = pending[~placed]
+
+            for frame in pending:
+                chosen[frame] = self._annulus_point(grid[frame], points[frame, :i], rng)
+            self._insert(grid, points, rows, i, chosen)
+
+        return points[:, m:]
+
+    def _cells(self, xy):
+        cells = np.floor((xy - self.low) / self.cell).astype(int)
+        return np.clip(cells, 0, np.array(self.shape) - 1)
+
+    def _insert(self, grid, points, rows, index, xy):
+        cells = self._cells(xy)
+        grid[rows, cells[:, 0], cells[:, 1]] = index
+        points[rows, index] = xy
+
+    def _free(self, grid, points, rows, candidates) -> np.ndarray:
+        """Boolean mask of candidates (frames, k, 2) at least min_dist from every point in their frame"""
+        neighbours = self._cells(candidates)[..., np.newaxis, :] + self.OFFSETS
+        neighbours = np.clip(neighbours, 0, np.array(self.shape) - 1)
+        index = grid[rows[..., np.newaxis], neighbours[..., 0], neighbours[..., 1]]  # (frames, k, 25)
+
+        others = points[rows[..., np.newaxis], np.maximum(index, 0)]
+        delta = others - candidates[..., np.newaxis, :]
+        close = (index >= 0) & (np.einsum("...i,...i->...", delta, delta) < self.min_dist ** 2)
+        return ~close.any(axis=-1)
+
+    def _annulus_point(self, grid, points, rng):
+        """One free point around the existing ones, drawn from all their annuli at once"""
+        if len(points) == 0:
+            raise ValueError("cannot place points: the sampling area is empty")
+
+        radius = self.min_dist * np.sqrt(rng.uniform(1, 4, size=(len(points), self.attempts)))
+        angle = rng.uniform(0, 2 * np.pi, size=(len(points), self.attempts))
+        candidates = points[:, np.newaxis, :] + radius[..., np.newaxis] * np.stack((np.cos(angle), np.sin(angle)), axis=-1)
+        candidates = candidates.reshape(-1, 2)
+        inside = np.all((candidates >= self.low) & (candidates <= self.high), axis=1)
+        candidates = candidates[inside]
+
+        padded = np.full((1,) + points.shape, np.nan)
+        padded[0] = points
+        free = np.flatnonzero(self._free(grid[np.newaxis], padded, np.zeros((1, 1), dtype=int), candidates[np.newaxis])[0])
+        if len(free) == 0:
+            raise ValueError(f"cannot place more than {len(points)} points {self.min_dist} apart in the sampling area")
+        return candidates[rng.choice(free)]
@@ -0,0 +1,93 @@
+import math
+import sys
+import time
+from contextlib import nullcontext
+
+import numpy as np
+
+
+class LatencyHistogram:
+    """Log-spaced latency histogram from 100 ns to 10 s, 20 bins per decade."""
+
+    MIN_SECONDS = 1e-7
+    BINS_PER_DECADE = 20
+    DECADES = 8
+
+    def __init__(self):
+        self.counts = np.zeros(self.BINS_PER_DECADE * self.DECADES + 1, dtype=np.int64)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float):
+        index = int(math.log10(max(seconds, self.MIN_SECONDS) / self.MIN_SECONDS) * self.BINS_PER_DECADE)
+        self.counts[min(index, len(self.counts) - 1)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, p: float) -> float:
+        """Upper edge of the bin holding the p-th percentile, in seconds"""
+        if self.count == 0:
+            return 0.0
+        index = int(np.searchsorted(np.cumsum(self.counts), math.ceil(self.count * p / 100)))
+        return min(self.MIN_SECONDS * 10 ** ((index + 1) / self.BINS_PER_DECADE), self.max)
+
+
+class _Section:
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.histogram.add(time.perf_counter() - self.start)
+        return False
+
+
+class Profiler:
+    """Per-phase latency histograms for the control loop.
+
+    Wrap a phase in ``with Profiler.section("name"):``. While disabled (the
+    default) section() returns a shared no-op context manager, so the hooks
+    cost one attribute check and an empty with block.
+    """
+
+    enabled = False
+    _NULL = nullcontext()
+    _sections = dict()  # {name: _Section}
+
+    @staticmethod
+    def enable(enabled=True):
+        Profiler.enabled = enabled
+
+    @staticmethod
+    def reset():
+        Profiler._sections = dict()
+
+    @staticmethod
+    def section(name: str):
+        if not Profiler.enabled:
+            return Profiler._NULL
+        section = Profiler._sections.get(name)
+        if section is None:
+            section = Profiler._sections[name] = _Section(LatencyHistogram())
+        return section
+
+    @staticmethod
+    def histograms() -> dict:
+        return {name: section.histogram for name, section in Profiler._sections.items()}
+
+    @staticmethod
+    def dump(file=sys.stdout):
+        """Prints one line per phase: calls, mean, p50, p90, p99 and max latency in microseconds"""
+        print(f"{'phase':<36}{'calls':>9}{'mean':>10}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}  (us)", file=file)
+        for name, histogram in sorted(Profiler.histograms().items()):
+            if histogram.count == 0:
+                continue
+            columns = [histogram.total / histogram.count] + [histogram.percentile(p) for p in (50, 90, 99)] + [histogram.max]
+            print(f"{name:<36}{histogram.count:>9}" + "".join(f"{c * 1e6:>10.1f}" for c in columns), file=file)
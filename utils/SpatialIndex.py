@@ -0,0 +1,59 @@
+import numpy as np
+from utils.Point import Point
+
+
+class SpatialIndex:
+    """Uniform grid over a set of 2-D positions, answering radius queries.
+
+    Build it once per frame and share it: every query only visits the cells
+    overlapping the query circle instead of every indexed position.
+    """
+
+    def __init__(self, cell_size: float = 0.35):
+        self.cell_size = cell_size
+        self.ids = np.zeros(0, dtype=int)
+        self.positions = np.zeros((0, 2))
+        self.cells = dict()  # {(cell_x, cell_y): array of indices into ids/positions}
+
+    def build(self, ids, positions):
+        """Indexes the given ids at the given (N, 2) positions, replacing the previous content"""
+        self.ids = np.asarray(ids, dtype=int)
+        self.positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+        self.cells = dict()
+        if len(self.ids) == 0:
+            return
+
+        keys = np.floor(self.positions / self.cell_size).astype(int)
+        order = np.lexsort((keys[:, 1], keys[:, 0]))
+        sorted_keys = keys[order]
+        starts = np.flatnonzero(np.any(np.diff(sorted_keys, axis=0) != 0, axis=1)) + 1
+        for chunk in np.split(order, starts):
+            self.cells[tuple(keys[chunk[0]])] = chunk
+
+    @staticmethod
+    def from_robots(robots: dict, cell_size: float = 0.35):
+        """Index of a {id: Robot} dict"""
+        index = SpatialIndex(cell_size)
+        index.build(list(robots.keys()), [(r.x, r.y) for r in robots.values()])
+        return index
+
+    def query_radius(self, center: Point, radius: float, exclude=None):
+        """Returns the (ids, positions) strictly closer than radius to center, sorted by id"""
+        min_x, min_y = int(np.floor((center.x - radius) / self.cell_size)), int(np.floor((center.y - radius) / self.cell_size))
+        max_x, max_y = int(np.floor((center.x + radius) / self.cell_size)), int(np.floor((center.y + radius) / self.cell_size))
+
+        chunks = [self.cells[(cx, cy)]
+                  for cx in range(min_x, max_x + 1)
+                  for cy in range(min_y, max_y + 1)
+                  if (cx, cy) in self.cells]
+        if len(chunks) == 0:
+            return self.ids[:0], self.positions[:0]
+
+        candidates = np.sort(np.concatenate(chunks))
+        delta = self.positions[candidates] - (center.x, center.y)
+        inside = candidates[np.hypot(delta[:, 0], delta[:, 1]) < radius]
+        if exclude is not None:
+            inside = inside[self.ids[inside] != exclude]
+
+        inside = inside[np.argsort(self.ids[inside], kind="stable")]
+        return self.ids[inside], self.positions[inside]
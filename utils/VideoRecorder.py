@@ -0,0 +1,100 @@
+import os
+import queue
+import threading
+
+import numpy as np
+
+
+class VideoRecorder:
+    """Encodes rendered frames to MP4 on a background thread.
+
+    push() never blocks the control loop: frames go into a bounded queue that
+    a worker thread drains into moviepy's ffmpeg writer (run at the lowest CPU
+    priority). When the queue is full the frame is dropped and only every
+    stride-th offered frame is kept until the worker catches up, so a slow
+    encoder costs video smoothness instead of simulation step latency.
+    """
+
+    def __init__(self, path, fps=40, max_queue=64, preset="ultrafast"):
+        # Optional dependency, only needed when a video is actually recorded
+        from moviepy.video.io.ffmpeg_writer import FFMPEG_VideoWriter
+
+        self._writer_class = FFMPEG_VideoWriter
+        self.path = path
+        self.fps = fps
+        self.preset = preset
+        self.frames = queue.Queue(maxsize=max_queue)
+
+        self.stride = 1   # Current subsampling: keep one in every stride offered frames
+        self.offered = 0
+        self.written = 0
+        self.dropped = 0  # Frames lost to a full queue or skipped by subsampling
+        self.error = None
+
+        self.worker = threading.Thread(target=self._run, name="VideoRecorder", daemon=True)
+        self.worker.start()
+
+    def wants_frame(self) -> bool:
+        """Whether the next frame would be kept; call it before drawing one to skip the work otherwise"""
+        self.offered += 1
+        if self.error is not None or self.offered % self.stride != 0:
+            self.dropped += 1
+            return False
+        if self.frames.full():
+            self.dropped += 1
+            self.stride = min(2 * self.stride, 16)
+            return False
+        return True
+
+    def push(self, frame: np.ndarray):
+        """Queues an (H, W, 3) uint8 frame accepted by wants_frame(); drops it if the encoder is behind"""
+        try:
+            self.frames.put_nowait(frame)
+        except queue.Full:
+            self.dropped += 1
+            return
+
+        # Back to full rate once the queue has mostly drained
+        if self.stride > 1 and self.frames.qsize() < self.frames.maxsize // 4:
+            self.stride //= 2
+
+    def _run(self):
+        writer = None
+        try:
+            while True:
+                frame = self.frames.get()
+                if frame is None:
+                    break
+                if writer is None:
+                    height, width = frame.shape[:2]
+                    writer = self._writer_class(self.path, (width, height), self.fps, codec="libx264",
+                                                preset=self.preset)
+                    self._lower_priority(writer.proc.pid)
+                writer.write_frame(np.ascontiguousarray(frame))
+                self.written += 1
+        except Exception as error:
+            self.error = error
+        finally:
+            if writer is not None:
+                writer.close()
+
+    @staticmethod
+    def _lower_priority(pid):
+        # The encoder should only use CPU time the simulation leaves idle
+        if hasattr(os, "setpriority"):
+            try:
+                os.setpriority(os.PRIO_PROCESS, pid, 19)
+            except OSError:
+                pass
+
+    def close(self):
+        """Flushes the queued frames and finalizes the file"""
+        while self.worker.is_alive():
+            try:
+                self.frames.put(None, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        self.worker.join()
+        if self.error is not None:
+            raise self.error
@@ -0,0 +1,87 @@
+from collections.abc import Mapping
+
+import numpy as np
+from rsoccer_gym.Entities import Frame
+
+
+class WorldSnapshot:
+    """Read-only structure-of-arrays copy of a frame's robots, built once per frame.
+
+    Robots are stored blue first then yellow; a yellow robot's id is offset by
+    n_robots_blue, matching the obstacle ids used by SSLExampleEnv. Agents get
+    RobotsView objects over it instead of their own filtered dict copies.
+    """
+
+    FIELDS = ("x", "y", "theta", "v_x", "v_y", "v_theta")
+
+    def __init__(self, frame: Frame, n_robots_blue: int):
+        self.robots = list(frame.robots_blue.values()) + list(frame.robots_yellow.values())
+        self.ids = np.array(list(frame.robots_blue.keys())
+                            + [id + n_robots_blue for id in frame.robots_yellow.keys()], dtype=int)
+        self.yellow = np.arange(len(self.robots)) >= len(frame.robots_blue)
+
+        values = np.array([[getattr(robot, field) or 0.0 for field in self.FIELDS] for robot in self.robots],
+                          dtype=float).reshape(-1, len(self.FIELDS))
+        # Frozen before slicing, so every field view below is read-only too
+        for array in (self.ids, self.yellow, values):
+            array.flags.writeable = False
+
+        self.x, self.y, self.theta, self.v_x, self.v_y, self.v_theta = values.T
+        self.positions = values[:, :2]
+        self.velocities = values[:, 3:5]
+
+        self.rows = {id: row for row, id in enumerate(self.ids.tolist())}
+
+    def mask(self, ids=None, exclude=None) -> np.ndarray:
+        """Boolean row mask keeping the given ids (all by default) minus the excluded id"""
+        keep = np.ones(len(self.robots), dtype=bool) if ids is None else np.isin(self.ids, list(ids))
+        if exclude is not None and exclude in self.rows:
+            keep[self.rows[exclude]] = False
+        return keep
+
+    def view(self, ids=None, exclude=None):
+        return RobotsView(self, self.mask(ids, exclude))
+
+
+class RobotsView(Mapping):
+    """Read-only {id: Robot} view over a subset of a WorldSnapshot.
+
+    It behaves like the dicts agents used to receive (iteration in id order,
+    lookup, items(), values()) without allocating per-agent copies, and exposes
+    the subset's arrays for vectorized code.
+    """
+
+    __slots__ = ("snapshot", "keep", "indices")
+
+    def __init__(self, snapshot: WorldSnapshot, keep: np.ndarray):
+        self.snapshot = snapshot
+        self.keep = keep
+        self.indices = np.flatnonzero(keep)
+
+    def __getitem__(self, id):
+        row = self.snapshot.rows.get(id)
+        if row is None or not self.keep[row]:
+            raise KeyError(id)
+        return self.snapshot.robots[row]
+
+    def __iter__(self):
+        return iter(self.snapshot.ids[self.indices].tolist())
+
+    def __len__(self):
+        return len(self.indices)
+
+    def copy(self):
+        # Immutable, so sharing is as safe as copying
+        return self
+
+    @property
+    def ids(self) -> np.ndarray:
+        return self.snapshot.ids[self.indices]
+
+    @property
+    def positions(self) -> np.ndarray:
+        return self.snapshot.positions[self.indices]
+
+    @property
+    def velocities(self) -> np.ndarray:
+        return self.snapshot.velocities[self.indices]
@@ -0,0 +1,73 @@
+import math
+import numpy as np
+from utils.ssl.Navigation import (
+    ADJUST_ANGLE_MIN_DIST,
+    ANGLE_EPSILON,
+    ANGLE_KP,
+    MAX_VELOCITY,
+    MIN_DIST_TO_PROP_VELOCITY,
+    M_TO_MM,
+    PROP_VELOCITY_MIN_FACTOR,
+)
+
+
+class CostMatrix:
+    """Vectorized robot x target cost matrices.
+
+    A cost model is any callable ``model(poses, targets) -> (N, M) array`` where
+    ``poses`` is an (N, 3) array of ``x, y, theta`` (metres, degrees) and
+    ``targets`` is an (M, 2) array of ``x, y`` (metres).
+    """
+
+    @staticmethod
+    def poses(robots) -> np.ndarray:
+        """(N, 3) array of x, y, theta for an iterable of Robot"""
+        return np.array([(r.x, r.y, r.theta or 0.0) for r in robots], dtype=float).reshape(-1, 3)
+
+    @staticmethod
+    def points(targets) -> np.ndarray:
+        """(M, 2) array of x, y for an iterable of Point"""
+        return np.array([(t.x, t.y) for t in targets], dtype=float).reshape(-1, 2)
+
+    @staticmethod
+    def build(robots, targets, model=None) -> np.ndarray:
+        """Returns the cost matrix of the given Robot and Point sequences under a cost model"""
+        model = CostMatrix.euclidean if model is None else model
+        return model(CostMatrix.poses(robots), CostMatrix.points(targets))
+
+    @staticmethod
+    def euclidean(poses: np.ndarray, targets: np.ndarray) -> np.ndarray:
+        """Straight-line distance from every robot to every target"""
+        delta = targets[np.newaxis, :, :] - poses[:, np.newaxis, :2]
+        return np.hypot(delta[..., 0], delta[..., 1])
+
+    @staticmethod
+    def time_to_reach(poses: np.ndarray, targets: np.ndarray, velocity_factor: float = 1.0) -> np.ndarray:
+        """Estimated seconds to reach every target following the Navigation.goToPoint profile.
+
+        Travel time integrates the proportional deceleration ramp inside
+        MIN_DIST_TO_PROP_VELOCITY. goToPoint scales the speed down linearly with
+        the heading error, which decays exponentially under ANGLE_KP, so the
+        time lost while turning is heading_error / (ANGLE_KP * (pi - ANGLE_EPSILON)).
+        """
+        delta = (targets[np.newaxis, :, :] - poses[:, np.newaxis, :2]) * M_TO_MM
+        distance = np.hypot(delta[..., 0], delta[..., 1])
+        max_velocity = MAX_VELOCITY * velocity_factor * M_TO_MM
+
+        # Constant speed outside the ramp, v(x) = v_max * (f + (1 - f) * x / D) inside it
+        ramp = MIN_DIST_TO_PROP_VELOCITY
+        slope = 1.0 - PROP_VELOCITY_MIN_FACTOR
+        inside = np.clip(distance, ADJUST_ANGLE_MIN_DIST, ramp)
+        ramp_time = ramp / (slope * max_velocity) * np.log(
+            (PROP_VELOCITY_MIN_FACTOR + slope * inside / ramp)
+            / (PROP_VELOCITY_MIN_FACTOR + slope * ADJUST_ANGLE_MIN_DIST / ramp)
+        )
+        cruise_time = np.maximum(distance - ramp, 0.0) / max_velocity
+
+        # Heading error between the robot body and the direction of the target
+        target_angle = np.arctan2(delta[..., 1], delta[..., 0])
+        robot_angle = np.radians(poses[:, 2])[:, np.newaxis]
+        heading_error = np.abs((target_angle - robot_angle + math.pi) % (2 * math.pi) - math.pi)
+        turn_time = heading_error / (ANGLE_KP * (math.pi - ANGLE_EPSILON))
+
+        return ramp_time + cruise_time + turn_time
@@ -68,4 +68,45 @@ class Navigation:
 
       return target_velocity, -kp * d_theta
     else:
-      return Point(0.0, 0.0), -kp * d_theta
\ No newline at end of file
+      return Point(0.0, 0.0), -kp * d_theta
+
+  @staticmethod
+  def goToPointBatch(poses: np.ndarray, targets: np.ndarray):
+    """Vectorized goToPoint for N robots at once.
+
+    poses is an (N, 3) array of x, y, theta (metres, degrees) and targets an
+    (N, 2) array of x, y (metres). Returns the (N, 2) local velocities and the
+    (N,) angular velocities that goToPoint would return for each robot.
+    """
+    poses = np.asarray(poses, dtype=float).reshape(-1, 3)
+    targets = np.asarray(targets, dtype=float).reshape(-1, 2)
+
+    delta = (targets - poses[:, :2]) * M_TO_MM
+    robot_angle = np.mod(poses[:, 2], 360.0)
+    robot_angle = np.radians(np.where(robot_angle > 180.0, robot_angle - 360.0, robot_angle))
+
+    distance_to_target = np.hypot(delta[:, 0], delta[:, 1])
+
+    # Use proportional speed to decelerate when getting close to desired target
+    max_velocity = np.where(
+      distance_to_target <= MIN_DIST_TO_PROP_VELOCITY,
+      MAX_VELOCITY * (distance_to_target * (1.0 - PROP_VELOCITY_MIN_FACTOR) / MIN_DIST_TO_PROP_VELOCITY + PROP_VELOCITY_MIN_FACTOR),
+      MAX_VELOCITY,
+    )
+
+    target_angle = np.arctan2(delta[:, 1], delta[:, 0])
+    d_theta = np.mod(robot_angle - target_angle, 2 * math.pi)
+    d_theta = np.where(d_theta >= math.pi, d_theta - 2 * math.pi, d_theta)
+
+    v_angle = np.mod(d_theta - (math.pi - ANGLE_EPSILON), 2 * math.pi)
+    v_angle = np.abs(np.where(v_angle >= math.pi, v_angle - 2 * math.pi, v_angle))
+    v_proportional = v_angle * (max_velocity / (math.pi - ANGLE_EPSILON))
+    v_proportional = np.where(distance_to_target > ADJUST_ANGLE_MIN_DIST, v_proportional, 0.0)
+
+    global_x = np.cos(target_angle) * v_proportional
+    global_y = np.sin(target_angle) * v_proportional
+    cos_theta, sin_theta = np.cos(robot_angle), np.sin(robot_angle)
+    local_velocity = np.stack((global_x * cos_theta + global_y * sin_theta,
+                               -global_x * sin_theta + global_y * cos_theta), axis=1)
+
+    return local_velocity, -ANGLE_KP * d_theta
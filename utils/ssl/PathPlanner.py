@@ -0,0 +1,210 @@
+import heapq
+import math
+import time
+
+import numpy as np
+from utils.Point import Point
+
+
+class PathPlanner:
+    """Interface of the path planners ExampleAgent can steer with.
+
+    Subclasses implement plan(). This class keeps one path per robot and only
+    asks for a new one when the goal moves, the robot drifts off the path, the
+    last plan ran out of budget before reaching the goal, or an obstacle
+    enters the corridor around the part of the path still ahead. steer()
+    returns a carrot point `lookahead` metres along the path, so
+    Navigation.goToPoint keeps cruising between waypoints.
+    """
+
+    def __init__(self, clearance=0.25, lookahead=0.5, goal_tolerance=0.05, budget=0.002):
+        self.clearance = clearance            # Minimum distance between the path and an obstacle centre
+        self.lookahead = lookahead
+        self.goal_tolerance = goal_tolerance  # Goal displacement that invalidates a cached path
+        self.budget = budget                  # Seconds of search allowed per plan() call
+        self.paths = dict()                   # {robot id: (goal (2,), waypoints (P, 2), complete)}
+        self.replans = 0
+
+    def reset(self):
+        self.paths = dict()
+
+    def plan(self, start: np.ndarray, goal: np.ndarray, obstacles: np.ndarray, budget: float):
+        """(P, 2) waypoints from start towards goal and whether they reach it within the budget"""
+        raise NotImplementedError
+
+    def steer(self, robot_id, position: Point, goal: Point, obstacles) -> Point:
+        start = np.array((position.x, position.y))
+        goal = np.array((goal.x, goal.y))
+        obstacles = np.asarray(obstacles, dtype=float).reshape(-1, 2)
+
+        cached = self.paths.get(robot_id)
+        ahead = None if cached is None else self._ahead(cached[1], start)
+        if ahead is None or self._stale(cached, ahead, start, goal, obstacles):
+            waypoints, complete = self.plan(start, goal, obstacles, self.budget)
+            self.paths[robot_id] = (goal, waypoints, complete)
+            self.replans += 1
+            ahead = self._ahead(waypoints, start)
+
+        return Point(*self._carrot(ahead).tolist())
+
+    def _stale(self, cached, ahead, start, goal, obstacles) -> bool:
+        cached_goal, waypoints, complete = cached
+        if not complete or np.hypot(*(cached_goal - goal)) > self.goal_tolerance:
+            return True
+        if np.hypot(*(ahead[0] - start)) > self.clearance:
+            return True
+
+        # Obstacles already touching the robot or the goal cannot be planned around; skip them
+        relevant = (np.hypot(*(obstacles - start).T) > self.clearance) & (np.hypot(*(obstacles - goal).T) > self.clearance)
+        corridor = self.clearance * 0.8
+        return bool(np.any(self.segment_distances(obstacles[relevant], ahead) < corridor))
+
+    @staticmethod
+    def segment_distances(points: np.ndarray, polyline: np.ndarray) -> np.ndarray:
+        """(K,) distance from every point to the nearest segment of the polyline"""
+        if len(points) == 0:
+            return np.zeros(0)
+        if len(polyline) == 1:
+            return np.hypot(*(points - polyline[0]).T)
+        a, b = polyline[:-1], polyline[1:]
+        ab = b - a
+        t = np.einsum("ksi,si->ks", points[:, np.newaxis] - a, ab) / np.maximum(np.einsum("si,si->s", ab, ab), 1e-12)
+        nearest = a + np.clip(t, 0.0, 1.0)[..., np.newaxis] * ab
+        return np.hypot(*(points[:, np.newaxis] - nearest).transpose(2, 0, 1)).min(axis=1)
+
+    @staticmethod
+    def _ahead(waypoints: np.ndarray, position: np.ndarray):
+        """Rest of the path from the projection of position onto it"""
+        if len(waypoints) < 2:
+            return waypoints
+        a, b = waypoints[:-1], waypoints[1:]
+        ab = b - a
+        t = np.clip(np.einsum("si,si->s", position - a, ab) / np.maximum(np.einsum("si,si->s", ab, ab), 1e-12), 0.0, 1.0)
+        nearest = a + t[:, np.newaxis] * ab
+        k = int(np.argmin(np.hypot(*(nearest - position).T)))
+        return np.vstack((nearest[k], waypoints[k + 1:]))
+
+    def _carrot(self, ahead: np.ndarray) -> np.ndarray:
+        lengths = np.hypot(*np.diff(ahead, axis=0).T)
+        travelled = np.concatenate(([0.0], np.cumsum(lengths)))
+        if travelled[-1] <= self.lookahead:
+            return ahead[-1]
+        k = int(np.searchsorted(travelled, self.lookahead)) - 1
+        t = (self.lookahead - travelled[k]) / max(lengths[k], 1e-12)
+        return ahead[k] + t * (ahead[k + 1] - ahead[k])
+
+
+class AStarPlanner(PathPlanner):
+    """A* on an occupancy grid of the field, shortened by line of sight.
+
+    Obstacles are discs of radius clearance rasterized on cells of
+    `resolution` metres; a disc already holding the start or the goal is
+    shrunk so the robot can still leave it or reach the target. The search
+    stops at the budget and returns the path to the expanded cell closest to
+    the goal (the planner keeps improving it on the next steps). The cell path
+    is then pulled taut: each waypoint jumps to the farthest cell it can see,
+    giving the any-angle paths Theta* would.
+    """
+
+    NEIGHBOURS = [(dx, dy, math.hypot(dx, dy)) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy]
+
+    def __init__(self, x_range, y_range, resolution=0.1, **kwargs):
+        super().__init__(**kwargs)
+        self.low = np.array([x_range[0], y_range[0]], dtype=float)
+        self.resolution = resolution
+        self.shape = tuple(int(n) for n in np.ceil((np.array([x_range[1], y_range[1]]) - self.low) / resolution) + 1)
+        self.centers = [self.low[axis] + resolution * np.arange(self.shape[axis]) for axis in (0, 1)]
+
+    def _cell(self, xy):
+        cell = np.clip(np.round((xy - self.low) / self.resolution).astype(int), 0, np.array(self.shape) - 1)
+        return int(cell[0]), int(cell[1])
+
+    def occupancy(self, obstacles, start, goal) -> np.ndarray:
+        """(W, H) boolean grid of cells closer than clearance to an obstacle"""
+        radius = np.minimum(self.clearance, 0.99 * np.minimum(np.hypot(*(obstacles - start).T), np.hypot(*(obstacles - goal).T)))
+        dx = self.centers[0][np.newaxis, :, np.newaxis] - obstacles[:, 0, np.newaxis, np.newaxis]
+        dy = self.centers[1][np.newaxis, np.newaxis, :] - obstacles[:, 1, np.newaxis, np.newaxis]
+        return np.any(dx * dx + dy * dy < (radius * radius)[:, np.newaxis, np.newaxis], axis=0)
+
+    def plan(self, start, goal, obstacles, budget):
+        deadline = time.perf_counter() + budget
+        occupied = self.occupancy(obstacles, start, goal)
+        blocked = occupied.tolist()
+        width, height = self.shape
+
+        source, target = self._cell(start), self._cell(goal)
+        blocked[source[0]][source[1]] = False
+        blocked[target[0]][target[1]] = False
+
+        def heuristic(cell):
+            return math.hypot(cell[0] - target[0], cell[1] - target[1])
+
+        cost = {source: 0.0}
+        parent = {source: None}
+        closed = set()
+        frontier = [(heuristic(source), source)]
+        best, best_h = source, heuristic(source)
+        expansions = 0
+
+        while frontier:
+            _, cell = heapq.heappop(frontier)
+            if cell in closed:
+                continue
+            closed.add(cell)
+
+            h = heuristic(cell)
+            if h < best_h:
+                best, best_h = cell, h
+            if cell == target:
+                break
+
+            expansions += 1
+            if expansions % 32 == 0 and time.perf_counter() > deadline:
+                break
+
+            x, y = cell
+            g = cost[cell]
+            for dx, dy, step in self.NEIGHBOURS:
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < width and 0 <= ny < height) or blocked[nx][ny]:
+                    continue
+                neighbour = (nx, ny)
+                new_cost = g + step
+                if new_cost < cost.get(neighbour, math.inf):
+                    cost[neighbour] = new_cost
+                    parent[neighbour] = cell
+                    heapq.heappush(frontier, (new_cost + heuristic(neighbour), neighbour))
+
+        cells = []
+        cell = best
+        while cell is not None:
+            cells.append(cell)
+            cell = parent[cell]
+        cells.reverse()
+
+        complete = best == target
+        waypoints = self.low + self.resolution * np.array(cells, dtype=float)
+        waypoints[0] = start
+        if complete:
+            waypoints[-1] = goal
+        return self._shorten(waypoints, occupied), complete
+
+    def _visible(self, a, b, occupied) -> bool:
+        samples = max(2, int(math.ceil(math.hypot(*(b - a)) / (0.5 * self.resolution))) + 1)
+        points = a + np.linspace(0.0, 1.0, samples)[:, np.newaxis] * (b - a)
+        cells = np.clip(np.round((points - self.low) / self.resolution).astype(int), 0, np.array(self.shape) - 1)
+        # The end cells may sit inside a shrunk disc; only the cells in between must be free
+        return not occupied[cells[1:-1, 0], cells[1:-1, 1]].any()
+
+    def _shorten(self, waypoints, occupied) -> np.ndarray:
+        if len(waypoints) <= 2:
+            return waypoints
+        kept = [waypoints[0]]
+        anchor, last = 0, 1
+        for k in range(2, len(waypoints)):
+            if not self._visible(waypoints[anchor], waypoints[k], occupied):
+                kept.append(waypoints[last])
+                anchor = last
+            last = k
+        kept.append(waypoints[-1])
+        return np.array(kept)
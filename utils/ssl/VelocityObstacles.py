@@ -0,0 +1,142 @@
+import numpy as np
+
+
+def _det(a, b):
+    return a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0]
+
+
+class ReciprocalVelocityObstacles:
+    """ORCA collision avoidance for a whole team at once.
+
+    Every controlled robot gets one half-plane of allowed velocities per other
+    robot, built as in RVO2 (cut-off circle, left/right leg or collision case)
+    from the relative positions and the frame velocities, all pairs in a single
+    broadcast. Controlled robots take half of the avoidance effort (they
+    cooperate); every other robot is assumed not to react and takes none.
+
+    The per-robot 2-D linear program is solved by candidate enumeration: the
+    preferred velocity, its projection onto every half-plane boundary and every
+    pairwise boundary intersection contain the exact optimum whenever it lies
+    inside the speed limit, and a ring of velocities on the speed circle covers
+    the rest. The feasible candidate closest to the preferred velocity wins;
+    if none is feasible, the one violating its worst constraint the least
+    (ORCA's fallback for crowded situations). Robots with at least one active
+    constraint have their preferred velocity turned by a small `bias` angle so
+    symmetric encounters (head-on, or an obstacle dead ahead) resolve to the
+    same side instead of stalling; unobstructed robots keep it as it is.
+    """
+
+    def __init__(self, radius=0.2, time_horizon=1.0, time_step=0.025, max_speed=0.75, neighbour_distance=2.0, ring=32,
+                 bias=0.05):
+        self.radius = radius                          # Combined radius of two robots plus a margin
+        self.time_horizon = time_horizon
+        self.time_step = time_step
+        self.max_speed = max_speed
+        self.neighbour_distance = neighbour_distance  # Robots farther than this add no constraint
+        angles = np.linspace(0.0, 2 * np.pi, ring, endpoint=False)
+        self.ring = np.stack((np.cos(angles), np.sin(angles)), axis=1)
+        self.bias = np.array([[np.cos(bias), np.sin(bias)], [-np.sin(bias), np.cos(bias)]])  # Row-vector rotation
+
+    def half_planes(self, positions, velocities, others, other_velocities, responsibility):
+        """(N, K, 2) points and directions of the ORCA lines; allowed velocities lie left of each line"""
+        rel_pos = others[np.newaxis] - positions[:, np.newaxis]          # (N, K, 2)
+        rel_vel = velocities[:, np.newaxis] - other_velocities[np.newaxis]
+        dist_sq = np.einsum("nki,nki->nk", rel_pos, rel_pos)
+        r, r_sq = self.radius, self.radius ** 2
+        tau = self.time_horizon
+
+        # No collision: project onto the truncated cone, on its cut-off circle or on a leg
+        w = rel_vel - rel_pos / tau
+        w_len = np.maximum(np.hypot(w[..., 0], w[..., 1]), 1e-12)
+        unit_w = w / w_len[..., np.newaxis]
+        dot = np.einsum("nki,nki->nk", w, rel_pos)
+        on_circle = (dot < 0) & (dot * dot > r_sq * w_len * w_len)
+
+        leg = np.sqrt(np.maximum(dist_sq - r_sq, 0.0))
+        x, y = rel_pos[..., 0], rel_pos[..., 1]
+        left = np.stack((x * leg - y * r, x * r + y * leg), axis=-1)
+        right = -np.stack((x * leg + y * r, -x * r + y * leg), axis=-1)
+        leg_direction = np.where((_det(rel_pos, w) > 0)[..., np.newaxis], left, right) / np.maximum(dist_sq, 1e-12)[..., np.newaxis]
+        leg_u = np.einsum("nki,nki->nk", rel_vel, leg_direction)[..., np.newaxis] * leg_direction - rel_vel
+
+        circle_direction = np.stack((unit_w[..., 1], -unit_w[..., 0]), axis=-1)
+        circle_u = (r / tau - w_len)[..., np.newaxis] * unit_w
+
+        # Already overlapping: resolve within one time step
+        w_hit = rel_vel - rel_pos / self.time_step
+        w_hit_len = np.maximum(np.hypot(w_hit[..., 0], w_hit[..., 1]), 1e-12)
+        unit_hit = w_hit / w_hit_len[..., np.newaxis]
+        hit_direction = np.stack((unit_hit[..., 1], -unit_hit[..., 0]), axis=-1)
+        hit_u = (r / self.time_step - w_hit_len)[..., np.newaxis] * unit_hit
+
+        colliding = (dist_sq <= r_sq)[..., np.newaxis]
+        direction = np.where(colliding, hit_direction, np.where(on_circle[..., np.newaxis], circle_direction, leg_direction))
+        u = np.where(colliding, hit_u, np.where(on_circle[..., np.newaxis], circle_u, leg_u))
+        point = velocities[:, np.newaxis] + responsibility[..., np.newaxis] * u
+        return point, direction
+
+    def solve(self, positions, velocities, preferred, others, other_velocities, cooperative=None, exclude=None):
+        """(N, 2) velocities closest to the preferred ones that respect every ORCA half-plane.
+
+        positions, velocities and preferred are (N, 2) for the controlled robots;
+        others and other_velocities are (K, 2) for every robot (controlled ones
+        included), cooperative is a (K,) mask of robots that also run ORCA and
+        exclude an (N, K) mask of pairs to skip (a robot and itself).
+        """
+        n, k = len(positions), len(others)
+        preferred = np.asarray(preferred, dtype=float)
+        if n == 0:
+            return np.zeros((0, 2))
+        if k == 0:
+            return self._clip(preferred)
+
+        cooperative = np.zeros(k, dtype=bool) if cooperative is None else np.asarray(cooperative, dtype=bool)
+        responsibility = np.broadcast_to(np.where(cooperative, 0.5, 1.0), (n, k))
+        point, direction = self.half_planes(positions, velocities, others, other_velocities, responsibility)
+
+        distance = np.hypot(*(others[np.newaxis] - positions[:, np.newaxis]).transpose(2, 0, 1))
+        active = distance < self.neighbour_distance
+        if exclude is not None:
+            active &= ~exclude
+        preferred = np.where(active.any(axis=1)[:, np.newaxis], preferred @ self.bias, preferred)
+
+        candidates = self._candidates(preferred, point, direction, active)   # (N, C, 2)
+
+        # Violation of each candidate against each active line (positive means outside)
+        violation = _det(direction[:, np.newaxis], point[:, np.newaxis] - candidates[:, :, np.newaxis])
+        violation = np.where(active[:, np.newaxis], violation, -np.inf).max(axis=2)   # (N, C)
+
+        gap = np.hypot(*(candidates - preferred[:, np.newaxis]).transpose(2, 0, 1))
+        feasible = violation <= 1e-9
+        score = np.where(feasible, gap, np.inf)
+        fallback = ~feasible.any(axis=1)
+        score[fallback] = violation[fallback]
+        return candidates[np.arange(n), np.argmin(score, axis=1)]
+
+    def _clip(self, velocities):
+        speed = np.hypot(velocities[..., 0], velocities[..., 1])
+        return velocities * np.minimum(1.0, self.max_speed / np.maximum(speed, 1e-12))[..., np.newaxis]
+
+    def _candidates(self, preferred, point, direction, active):
+        n, k = active.shape
+        # Projection of the preferred velocity onto every line
+        along = np.einsum("nki,nki->nk", preferred[:, np.newaxis] - point, direction)
+        projections = point + along[..., np.newaxis] * direction
+
+        # Pairwise line intersections (vertices of the feasible polygon)
+        denominator = _det(direction[:, :, np.newaxis], direction[:, np.newaxis, :])      # (N, K, K)
+        offset = point[:, :, np.newaxis] - point[:, np.newaxis, :]
+        t = _det(direction[:, np.newaxis, :], offset) / np.where(np.abs(denominator) > 1e-9, denominator, np.nan)
+        vertices = point[:, :, np.newaxis] + t[..., np.newaxis] * direction[:, :, np.newaxis]
+        vertices = np.where(np.isfinite(vertices) & (active[:, :, np.newaxis] & active[:, np.newaxis, :])[..., np.newaxis],
+                            vertices, preferred[:, np.newaxis, np.newaxis])
+
+        candidates = np.concatenate((
+            preferred[:, np.newaxis],
+            np.where(active[..., np.newaxis], projections, preferred[:, np.newaxis]),
+            vertices.reshape(n, k * k, 2),
+            np.broadcast_to(self.ring * self.max_speed, (n,) + self.ring.shape),
+            np.broadcast_to(self.ring * self.max_speed * 0.5, (n,) + self.ring.shape),
+            np.zeros((n, 1, 2)),
+        ), axis=1)
+        return self._clip(candidates)
@@ -1,5 +1,6 @@
 from rsoccer_gym.Entities import Robot
 from utils.Point import Point
+from utils.Profiler import Profiler
 
 class BaseAgent:
     """Abstract Agent."""
@@ -19,6 +20,10 @@ class BaseAgent:
         self.next_vel = Point(0, 0)  # Próxima velocidade a ser atribuída
         self.angle_vel = float(0)  # Velocidade angular a ser atribuída
 
+        # Nomes das fases medidas pelo Profiler
+        name = type(self).__name__
+        self.profile_phases = (f"{name}.observe", f"{name}.decision", f"{name}.post_decision")
+
 
     def step(self, 
              self_robot: Robot, 
@@ -27,6 +32,25 @@ class BaseAgent:
              targets:    list[Point] = [], 
              keep_targets=False) -> Robot:
 
+        observe_phase, decision_phase, post_decision_phase = self.profile_phases
+        with Profiler.section(observe_phase):
+            self.observe(self_robot, opponents, teammates, targets, keep_targets)
+
+        with Profiler.section(decision_phase):
+            self.decision()
+        with Profiler.section(post_decision_phase):
+            self.post_decision()
+
+        return self.command()
+
+    def observe(self, 
+                self_robot: Robot, 
+                opponents:  dict[int, Robot] = dict(), 
+                teammates:  dict[int, Robot] = dict(), 
+                targets:    list[Point] = [], 
+                keep_targets=False):
+        """Updates the agent state for the current frame, without deciding anything."""
+
         # Zera as velocidades linear e angular do robô
         self.reset()
         
@@ -44,9 +68,8 @@ class BaseAgent:
         self.opponents = opponents.copy()
         self.teammates = teammates.copy()
 
-        self.decision()
-        self.post_decision()
-
+    def command(self) -> Robot:
+        """Returns the command built from the velocities set by the last decision."""
         return Robot( id=self.id, yellow=self.yellow,
                       v_x=self.next_vel.x, v_y=self.next_vel.y, v_theta=self.angle_vel)
 
@@ -0,0 +1,63 @@
+import time
+from functools import partial
+
+import gymnasium as gym
+from gymnasium.envs.registration import register
+
+from utils.CLI import vector_cli, Difficulty
+
+ENV_ID = "SSL-Project"
+
+
+def register_envs():
+    """Registers SSL-Project once per process (vector subprocesses call it again)"""
+    if ENV_ID not in gym.registry:
+        register(
+            id=ENV_ID,
+            entry_point="sslenv:SSLExampleEnv",
+            kwargs={"render_mode": None},
+        )
+
+
+def make_env(difficulty=Difficulty.VERY_HARD, render_mode=None, max_steps=20000):
+    """Headless SSL-Project, truncated after max_steps. Module level so AsyncVectorEnv can pickle it"""
+    register_envs()
+    return gym.make(ENV_ID, difficulty=difficulty, render_mode=render_mode, max_episode_steps=max_steps)
+
+
+def make_vector_env(num_envs, difficulty=Difficulty.VERY_HARD, asynchronous=True, max_steps=20000):
+    """num_envs copies stepping in lockstep, in subprocesses (AsyncVectorEnv) or in this process (SyncVectorEnv).
+
+    Every copy owns its robosim instance, agents and random stream; reset(seed=s)
+    seeds copy k with s + k, and finished or truncated copies reset automatically.
+    """
+    env_fns = [partial(make_env, difficulty, None, max_steps) for _ in range(num_envs)]
+    if asynchronous:
+        return gym.vector.AsyncVectorEnv(env_fns)
+    return gym.vector.SyncVectorEnv(env_fns)
+
+
+def main():
+    args = vector_cli()
+    difficulty = Difficulty(args.difficulty)
+    kind = "SyncVectorEnv" if args.sync else "AsyncVectorEnv"
+
+    print(f"{difficulty.name}, {kind}, {args.steps} vector steps")
+    print(f"{'envs':>6}{'steps/s':>12}{'per env':>12}")
+    for num_envs in args.num_envs:
+        envs = make_vector_env(num_envs, difficulty, asynchronous=not args.sync)
+        envs.reset(seed=args.seed)
+        actions = envs.action_space.sample()
+
+        start_time = time.perf_counter()
+        for _ in range(args.steps):
+            envs.step(actions)
+        wall_time = time.perf_counter() - start_time
+        envs.close()
+
+        throughput = num_envs * args.steps / wall_time
+        print(f"{num_envs:>6}{throughput:>12.1f}{throughput / num_envs:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()